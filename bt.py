@@ -42,17 +42,40 @@ EXAMPLES:
 """
 
 import argparse
+import io
 import sys
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, List, Optional
 
 from config import get_market_status, DATA_DIR
 from signatures import SignatureManager, Signature
-from file_parser import parse_file, parse_content, get_buy_tickers
-from scanner_bridge import ScannerBridge
-from prices import PriceFetcher
-from positions import PositionsManager
+
+# Heavier modules (yfinance/pandas via prices, bs4 via file_parser, numpy
+# via pnl) are imported inside the commands that need them so that
+# read-only commands like `show` or `delete` start up quickly.
+
+# Table row templates, built once instead of per row
+_SIG_ROW = "{:<28} {:<12} {:<8} {:<6} {:<8} {:<10} {:<12} {:<10}\n".format
+_OPEN_ROW = "{:<8} {:<12} ${:<9.2f} ${:<9.2f} {}{:>+6.1f}%   {:<12}\n".format
+_CLOSED_ROW = "{:<8} ${:<9.2f} ${:<9.2f} {}{:>+6.1f}%   {:<12} {:<20}\n".format
+_LIVE_ROW = "{:<8} ${:<9.2f} {:<10} {:<10} ${:<11.2f} {}{:>+6.1f}%\n".format
+
+
+def _signature_row(sig: Signature, unrealized: float) -> tuple:
+    """Column values for one signature in the `signatures` table"""
+    summary = sig.get_summary()
+    
+    total = summary['realized_pnl_pct'] + unrealized
+    
+    realized_str = f"{summary['realized_pnl_pct']:+.1f}%" if summary['closed_positions'] > 0 else "-"
+    unrealized_str = f"{unrealized:+.1f}%" if summary['open_positions'] > 0 else "-"
+    total_str = f"{total:+.1f}%"
+    
+    return (sig.signature_id, sig.created_at[:10], sig.mode,
+            summary['open_positions'], summary['closed_positions'],
+            realized_str, unrealized_str, total_str)
 
 
 class BacktestCLI:
@@ -60,33 +83,59 @@ class BacktestCLI:
     
     def __init__(self):
         self.sig_mgr = SignatureManager()
-        self.scanner = ScannerBridge()
-        self.prices = PriceFetcher()
-        self.positions = PositionsManager()
+    
+    @cached_property
+    def scanner(self):
+        from scanner_bridge import ScannerBridge
+        return ScannerBridge()
+    
+    @cached_property
+    def prices(self):
+        from prices import get_fetcher
+        return get_fetcher()
+    
+    @cached_property
+    def positions(self):
+        from positions import PositionsManager
+        return PositionsManager()
     
     # =========================================================================
     # PROCESS FILE
     # =========================================================================
     
-    def cmd_process(self, filepath: str, mode: str = 'all') -> dict:
+    def cmd_process(self, filepath: str, mode: str = 'all', legacy_parser: bool = False) -> dict:
         """
         Process a scanner output file.
         
         - If file was seen before (same content), returns existing signature
         - If new file, creates signature with entry prices based on market timing
+        - legacy_parser: parse HTML with BeautifulSoup instead of lxml
         """
+        from file_parser import parse_content, parse_content_fast, get_buy_tickers
+        
         path = Path(filepath)
         if not path.exists():
             return {'success': False, 'error': f"File not found: {filepath}"}
         
         print(f"📄 Processing: {path.name}")
         
-        # Read file
-        with open(path, encoding='utf-8') as f:
-            content = f.read()
+        # Read file (hashed while reading, so it isn't hashed again below)
+        content, file_hash = self.sig_mgr.read_file(path, mode)
+        
+        # Seen this exact file + mode before? Skip parsing entirely
+        existing = self.sig_mgr.get_by_hash(file_hash)
+        if existing:
+            print(f"   Mode: {mode}")
+            self._print_existing(existing)
+            return {
+                'success': True,
+                'signature': existing.signature_id,
+                'is_new': False,
+                'positions': len(existing.positions)
+            }
         
         # Parse stocks
-        parsed = parse_content(content)
+        parsed = parse_content(content) if legacy_parser else parse_content_fast(content)
         
         buy_tickers = get_buy_tickers(parsed, mode)
         print(f"   Mode: {mode}")
@@ -101,7 +150,8 @@ class BacktestCLI:
             file_content=content,
             source_file=path.name,
             mode=mode,
-            parsed_stocks=parsed
+            parsed_stocks=parsed,
+            precomputed_hash=file_hash
         )
         
         if is_new:
@@ -116,12 +166,7 @@ class BacktestCLI:
             if len(sig.positions) > 10:
                 print(f"      ... and {len(sig.positions) - 10} more")
         else:
-            summary = sig.get_summary()
-            print(f"\n📎 EXISTING signature found: {sig.signature_id}")
-            print(f"   Created: {sig.created_at}")
-            print(f"   Positions: {summary['open_positions']} open, "
-                  f"{summary['closed_positions']} closed")
-            print(f"   Realized P/L: {summary['realized_pnl_pct']:.1f}%")
+            self._print_existing(sig)
         
         return {
             'success': True,
@@ -130,72 +175,67 @@ class BacktestCLI:
             'positions': len(sig.positions)
         }
     
+    def _print_existing(self, sig: Signature):
+        """Print summary of a signature matched by file hash"""
+        summary = sig.get_summary()
+        print(f"\n📎 EXISTING signature found: {sig.signature_id}")
+        print(f"   Created: {sig.created_at}")
+        print(f"   Positions: {summary['open_positions']} open, "
+              f"{summary['closed_positions']} closed")
+        print(f"   Realized P/L: {summary['realized_pnl_pct']:.1f}%")
+    
     # =========================================================================
     # SIGNATURES LIST
     # =========================================================================
     
     def cmd_signatures(self, mode: Optional[str] = None, limit: int = 20) -> str:
         """List all signatures with P/L summary"""
+        import numpy as np
+        from pnl import pnl_percent, group_sum
+        
         sigs = self.sig_mgr.list_all(mode=mode, limit=limit)
         
         if not sigs:
             return "📭 No signatures found.\n\nUse 'bt.py process <file>' to create one."
         
+        # Collect open positions in a single pass: flat (signature, entry,
+        # ticker) columns for the P/L vectors plus the tickers to quote
+        sig_idx, entries, open_tickers = [], [], []
+        for i, sig in enumerate(sigs):
+            for ticker, pos in sig.positions.items():
+                if pos.status == "open":
+                    sig_idx.append(i)
+                    entries.append(pos.entry_price)
+                    open_tickers.append(ticker)
+        
         # Fetch current prices for unrealized P/L
-        all_open_tickers = set()
-        for sig in sigs:
-            all_open_tickers.update(sig.get_open_tickers())
+        all_open_tickers = set(open_tickers)
         
         current_prices = {}
         if all_open_tickers:
             current_prices = self.prices.get_current_prices(list(all_open_tickers))
         
-        lines = []
-        lines.append(f"\n📋 SIGNATURES ({len(sigs)})")
-        lines.append("=" * 100)
-        lines.append(f"{'ID':<28} {'Date':<12} {'Mode':<8} {'Open':<6} "
-                    f"{'Closed':<8} {'Realized':<10} {'Unrealized':<12} {'Total':<10}")
-        lines.append("-" * 100)
+        # Unrealized P/L for every open position in one vectorized pass,
+        # then summed per signature (tickers without a quote count as 0)
+        currents = [current_prices.get(t, np.nan) for t in open_tickers]
+        unrealized_by_sig = group_sum(pnl_percent(entries, currents), sig_idx, len(sigs))
         
-        for sig in sigs:
-            summary = sig.get_summary()
-            
-            # Calculate unrealized P/L
-            unrealized = 0.0
-            for ticker, pos in sig.positions.items():
-                if pos.status == "open" and ticker in current_prices:
-                    pnl = ((current_prices[ticker] - pos.entry_price) / pos.entry_price) * 100
-                    unrealized += pnl
-            
-            total = summary['realized_pnl_pct'] + unrealized
-            
-            # Format
-            realized_str = f"{summary['realized_pnl_pct']:+.1f}%" if summary['closed_positions'] > 0 else "-"
-            unrealized_str = f"{unrealized:+.1f}%" if summary['open_positions'] > 0 else "-"
-            total_str = f"{total:+.1f}%"
-            
-            # Win/loss indicator
-            if summary['closed_positions'] > 0:
-                win_loss = f"({summary['win_count']}/{summary['closed_positions']})"
-            else:
-                win_loss = ""
-            
-            lines.append(
-                f"{sig.signature_id:<28} "
-                f"{sig.created_at[:10]:<12} "
-                f"{sig.mode:<8} "
-                f"{summary['open_positions']:<6} "
-                f"{summary['closed_positions']:<8} "
-                f"{realized_str:<10} "
-                f"{unrealized_str:<12} "
-                f"{total_str:<10}"
-            )
-        
-        lines.append("-" * 100)
-        lines.append(f"\nUse 'bt.py report <signature>' for detailed view")
-        lines.append(f"Use 'bt.py live' for real-time P/L")
+        buf = io.StringIO()
+        w = buf.write
+        w(f"\n📋 SIGNATURES ({len(sigs)})\n")
+        w("=" * 100 + "\n")
+        w(f"{'ID':<28} {'Date':<12} {'Mode':<8} {'Open':<6} "
+          f"{'Closed':<8} {'Realized':<10} {'Unrealized':<12} {'Total':<10}\n")
+        w("-" * 100 + "\n")
         
-        return "\n".join(lines)
+        for row in map(_signature_row, sigs, unrealized_by_sig):
+            w(_SIG_ROW(*row))
+        
+        w("-" * 100 + "\n")
+        w(f"\nUse 'bt.py report <signature>' for detailed view\n")
+        w(f"Use 'bt.py live' for real-time P/L")
+        
+        return buf.getvalue()
     
     # =========================================================================
     # DETAILED REPORT
@@ -203,6 +243,8 @@ class BacktestCLI:
     
     def cmd_report(self, signature_id: str) -> str:
         """Show detailed report for a signature"""
+        from pnl import pnl_percent
+        
         sig = self.sig_mgr.get_by_id(signature_id)
         
         if not sig:
@@ -214,74 +256,72 @@ class BacktestCLI:
         open_tickers = sig.get_open_tickers()
         current_prices = self.prices.get_current_prices(open_tickers) if open_tickers else {}
         
-        lines = []
-        lines.append("=" * 80)
-        lines.append(f"📊 SIGNATURE REPORT: {sig.signature_id}")
-        lines.append("=" * 80)
-        lines.append(f"Created: {sig.created_at}")
-        lines.append(f"Source: {sig.source_file}")
-        lines.append(f"Mode: {sig.mode}")
-        lines.append(f"Market: {sig.market_status}")
-        lines.append("-" * 80)
+        buf = io.StringIO()
+        w = buf.write
+        w("=" * 80 + "\n")
+        w(f"📊 SIGNATURE REPORT: {sig.signature_id}\n")
+        w("=" * 80 + "\n")
+        w(f"Created: {sig.created_at}\n")
+        w(f"Source: {sig.source_file}\n")
+        w(f"Mode: {sig.mode}\n")
+        w(f"Market: {sig.market_status}\n")
+        w("-" * 80 + "\n")
         
         # Summary
-        lines.append(f"\n📈 SUMMARY")
-        lines.append(f"   Total Positions: {summary['total_positions']}")
-        lines.append(f"   Open: {summary['open_positions']}")
-        lines.append(f"   Closed: {summary['closed_positions']}")
+        w(f"\n📈 SUMMARY\n")
+        w(f"   Total Positions: {summary['total_positions']}\n")
+        w(f"   Open: {summary['open_positions']}\n")
+        w(f"   Closed: {summary['closed_positions']}\n")
         if summary['closed_positions'] > 0:
-            lines.append(f"   Win Rate: {summary['win_count']}/{summary['closed_positions']} "
-                        f"({summary['win_rate']:.1f}%)")
-            lines.append(f"   Realized P/L: {summary['realized_pnl_pct']:+.1f}%")
+            w(f"   Win Rate: {summary['win_count']}/{summary['closed_positions']} "
+              f"({summary['win_rate']:.1f}%)\n")
+            w(f"   Realized P/L: {summary['realized_pnl_pct']:+.1f}%\n")
         
         # Open positions
         open_positions = [p for p in sig.positions.values() if p.status == "open"]
         if open_positions:
-            lines.append(f"\n🟢 OPEN POSITIONS ({len(open_positions)})")
-            lines.append("-" * 80)
-            lines.append(f"{'Ticker':<8} {'Category':<12} {'Entry$':<10} "
-                        f"{'Current$':<10} {'P/L%':<10} {'Entry Date':<12}")
-            lines.append("-" * 80)
-            
-            total_unrealized = 0
-            for pos in sorted(open_positions, key=lambda x: x.entry_date):
-                current = current_prices.get(pos.ticker, pos.entry_price)
-                pnl = ((current - pos.entry_price) / pos.entry_price) * 100
-                total_unrealized += pnl
-                
+            w(f"\n🟢 OPEN POSITIONS ({len(open_positions)})\n")
+            w("-" * 80 + "\n")
+            w(f"{'Ticker':<8} {'Category':<12} {'Entry$':<10} "
+              f"{'Current$':<10} {'P/L%':<10} {'Entry Date':<12}\n")
+            w("-" * 80 + "\n")
+            
+            open_positions.sort(key=lambda x: x.entry_date)
+            currents = [current_prices.get(p.ticker, p.entry_price) for p in open_positions]
+            pnls = pnl_percent([p.entry_price for p in open_positions], currents)
+            total_unrealized = pnls.sum()
+            
+            for pos, current, pnl in zip(open_positions, currents, pnls):
                 emoji = "🟢" if pnl > 0 else "🔴"
-                lines.append(f"{pos.ticker:<8} {pos.category:<12} "
-                            f"${pos.entry_price:<9.2f} ${current:<9.2f} "
-                            f"{emoji}{pnl:>+6.1f}%   {pos.entry_date:<12}")
+                w(_OPEN_ROW(pos.ticker, pos.category, pos.entry_price, current,
+                            emoji, pnl, pos.entry_date))
             
-            lines.append("-" * 80)
+            w("-" * 80 + "\n")
             avg = total_unrealized / len(open_positions)
-            lines.append(f"{'Unrealized Total:':<42} {total_unrealized:>+8.1f}% "
-                        f"(avg {avg:+.1f}%)")
+            w(f"{'Unrealized Total:':<42} {total_unrealized:>+8.1f}% "
+              f"(avg {avg:+.1f}%)\n")
         
         # Closed positions
         closed_positions = [p for p in sig.positions.values() if p.status == "closed"]
         if closed_positions:
-            lines.append(f"\n📉 CLOSED POSITIONS ({len(closed_positions)})")
-            lines.append("-" * 80)
-            lines.append(f"{'Ticker':<8} {'Entry$':<10} {'Exit$':<10} "
-                        f"{'P/L%':<10} {'Reason':<12} {'Dates':<20}")
-            lines.append("-" * 80)
+            w(f"\n📉 CLOSED POSITIONS ({len(closed_positions)})\n")
+            w("-" * 80 + "\n")
+            w(f"{'Ticker':<8} {'Entry$':<10} {'Exit$':<10} "
+              f"{'P/L%':<10} {'Reason':<12} {'Dates':<20}\n")
+            w("-" * 80 + "\n")
             
             for pos in sorted(closed_positions, key=lambda x: x.exit_date or '', reverse=True):
                 emoji = "🟢" if (pos.pnl_pct or 0) > 0 else "🔴"
                 dates = f"{pos.entry_date} → {pos.exit_date}"
-                lines.append(f"{pos.ticker:<8} ${pos.entry_price:<9.2f} "
-                            f"${pos.exit_price or 0:<9.2f} "
-                            f"{emoji}{pos.pnl_pct or 0:>+6.1f}%   "
-                            f"{pos.exit_reason or '':<12} {dates:<20}")
+                w(_CLOSED_ROW(pos.ticker, pos.entry_price, pos.exit_price or 0,
+                              emoji, pos.pnl_pct or 0, pos.exit_reason or '', dates))
             
-            lines.append("-" * 80)
-            lines.append(f"{'Realized Total:':<42} {summary['realized_pnl_pct']:>+8.1f}%")
+            w("-" * 80 + "\n")
+            w(f"{'Realized Total:':<42} {summary['realized_pnl_pct']:>+8.1f}%\n")
         
-        lines.append("\n" + "=" * 80)
+        w("\n" + "=" * 80)
         
-        return "\n".join(lines)
+        return buf.getvalue()
     
     # =========================================================================
     # CHECK SELLS
@@ -303,8 +343,7 @@ class BacktestCLI:
         else:
             print("🔍 Checking open positions for sells...")
         
-        # Load portfolio positions for cost basis P&L
-        self.positions.load()
+        # Portfolio positions for cost basis P&L (loaded on first access)
         has_positions = len(self.positions) > 0
         if has_positions:
             print(f"   📊 Loaded {len(self.positions)} positions from mypositions.csv")
@@ -448,6 +487,12 @@ class BacktestCLI:
         closed_count = 0
         closed_details = []
         
+        # IDs in all_open are exact, so resolve them straight from the loaded
+        # signatures instead of going through get_by_id's partial matching
+        sig_by_id = self.sig_mgr.signatures
+        dirty = {}  # signature_id -> Signature, written once after the loop
+        today = datetime.now().strftime("%Y-%m-%d")  # exit date for the whole sweep
+        
         for ticker in sells:
             if ticker not in exit_prices:
                 continue
@@ -456,9 +501,9 @@ class BacktestCLI:
             
             # Close in all signatures that have this open
             for sig_id, pos in all_open.get(ticker, []):
-                sig = self.sig_mgr.get_by_id(sig_id)
-                if sig and sig.close_position(ticker, price, "sell_signal"):
-                    self.sig_mgr.update_signature(sig)
+                sig = sig_by_id.get(sig_id)
+                if sig and sig.close_position(ticker, price, "sell_signal", today):
+                    dirty[sig_id] = sig
                     closed_count += 1
                     
                     pnl = ((price - pos.entry_price) / pos.entry_price) * 100
@@ -470,6 +515,8 @@ class BacktestCLI:
                         'pnl': pnl
                     })
         
+        self.sig_mgr.update_signatures(list(dirty.values()))
+        
         # Report
         if closed_details:
             print(f"\n📉 Closed {closed_count} positions:")
@@ -486,6 +533,9 @@ class BacktestCLI:
     
     def cmd_live(self) -> str:
         """Show live P/L with current quotes for all signatures"""
+        import numpy as np
+        from pnl import live_aggregate
+        
         sigs = self.sig_mgr.list_all(limit=100)
         
         if not sigs:
@@ -496,9 +546,7 @@ class BacktestCLI:
         for sig in sigs:
             for ticker, pos in sig.positions.items():
                 if pos.status == "open":
-                    if ticker not in all_open:
-                        all_open[ticker] = []
-                    all_open[ticker].append((sig.signature_id, pos))
+                    all_open.setdefault(ticker, []).append((sig.signature_id, pos))
         
         if not all_open:
             return "📭 No open positions."
@@ -509,53 +557,51 @@ class BacktestCLI:
         
         market = get_market_status()
         
-        lines = []
-        lines.append("=" * 90)
-        lines.append(f"📈 LIVE P/L - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"   Market: {market['description']}")
-        lines.append("=" * 90)
-        
-        lines.append(f"\n{'Ticker':<8} {'Current$':<10} {'Change':<10} "
-                    f"{'Positions':<10} {'Avg Entry':<12} {'P/L%':<10}")
-        lines.append("-" * 90)
-        
-        total_pnl = 0
-        total_positions = 0
-        
-        for ticker in sorted(all_open.keys()):
-            positions = all_open[ticker]
-            quote = quotes.get(ticker, {})
-            
-            current = quote.get('price') or 0
-            if not current:
+        buf = io.StringIO()
+        w = buf.write
+        w("=" * 90 + "\n")
+        w(f"📈 LIVE P/L - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        w(f"   Market: {market['description']}\n")
+        w("=" * 90 + "\n")
+        
+        w(f"\n{'Ticker':<8} {'Current$':<10} {'Change':<10} "
+          f"{'Positions':<10} {'Avg Entry':<12} {'P/L%':<10}\n")
+        w("-" * 90 + "\n")
+        
+        # Flatten positions (entry + ticker index) and aggregate per ticker
+        tickers = sorted(all_open.keys())
+        entries, group_ids = [], []
+        for i, ticker in enumerate(tickers):
+            for _, pos in all_open[ticker]:
+                entries.append(pos.entry_price)
+                group_ids.append(i)
+        currents = [quotes.get(t, {}).get('price') or np.nan for t in tickers]
+        
+        avg_entries, counts, pnls, avg_pnl, total_positions = live_aggregate(
+            entries, group_ids, currents)
+        
+        for i, ticker in enumerate(tickers):
+            current = currents[i]
+            if not current > 0:
                 continue
             
-            # Average entry across signatures
-            total_entry = sum(pos.entry_price for _, pos in positions)
-            avg_entry = total_entry / len(positions)
-            
-            # P/L
-            pnl = ((current - avg_entry) / avg_entry) * 100
-            total_pnl += pnl * len(positions)
-            total_positions += len(positions)
+            pnl = pnls[i]
             
             # Day change
-            change = quote.get('change_pct')
+            change = quotes[ticker].get('change_pct')
             change_str = f"{change:+.1f}%" if change else "-"
             
             emoji = "🟢" if pnl > 0 else "🔴"
             
-            lines.append(f"{ticker:<8} ${current:<9.2f} {change_str:<10} "
-                        f"{len(positions):<10} ${avg_entry:<11.2f} {emoji}{pnl:>+6.1f}%")
+            w(_LIVE_ROW(ticker, current, change_str, counts[i], avg_entries[i], emoji, pnl))
         
-        lines.append("-" * 90)
-        avg_pnl = total_pnl / total_positions if total_positions > 0 else 0
-        lines.append(f"{'TOTAL':<8} {'':<10} {'':<10} "
-                    f"{total_positions:<10} {'':<12} {avg_pnl:>+6.1f}%")
+        w("-" * 90 + "\n")
+        w(f"{'TOTAL':<8} {'':<10} {'':<10} "
+          f"{total_positions:<10} {'':<12} {avg_pnl:>+6.1f}%\n")
         
-        lines.append("\n" + "=" * 90)
+        w("\n" + "=" * 90)
         
-        return "\n".join(lines)
+        return buf.getvalue()
     
     # =========================================================================
     # MANUAL CLOSE
@@ -595,12 +641,12 @@ class BacktestCLI:
         
         # Close positions
         closed = []
+        today = datetime.now().strftime("%Y-%m-%d")
         for sig_id, sig in targets:
             pos = sig.positions[ticker]
             entry = pos.entry_price
             
-            sig.close_position(ticker, price, "manual")
-            self.sig_mgr.update_signature(sig)
+            sig.close_position(ticker, price, "manual", today)
             
             pnl = ((price - entry) / entry) * 100
             closed.append({
@@ -610,6 +656,8 @@ class BacktestCLI:
                 'pnl': pnl
             })
         
+        self.sig_mgr.update_signatures([sig for _, sig in targets])
+        
         # Report
         print(f"✅ Closed {ticker} in {len(closed)} signature(s)")
         for c in closed:
@@ -625,11 +673,13 @@ class BacktestCLI:
     
     def cmd_show(self, signature_id: str) -> str:
         """Show stored output for a signature"""
-        content = self.sig_mgr.get_output_content(signature_id)
+        limit = 8000
+        output = self.sig_mgr.get_output_head(signature_id, limit)
         
-        if content is None:
+        if output is None:
             return f"❌ Signature not found or output missing: {signature_id}"
         
+        head, total = output
         sig = self.sig_mgr.get_by_id(signature_id)
         
         lines = []
@@ -637,9 +687,9 @@ class BacktestCLI:
         lines.append(f"   Source: {sig.source_file}")
         lines.append(f"   Date: {sig.created_at}")
         lines.append("=" * 80)
-        lines.append(content[:8000])
-        if len(content) > 8000:
-            lines.append(f"\n... truncated ({len(content)} total chars)")
+        lines.append(head[:limit])
+        if len(head) > limit:
+            lines.append(f"\n... truncated ({total} bytes total)")
         
         return "\n".join(lines)
     
@@ -654,7 +704,7 @@ class BacktestCLI:
         If signature_id provided, generates single report.
         Otherwise generates index + all reports.
         """
-        from html_report import save_report, save_signatures_index
+        from html_report import save_report, save_reports_batch
         from pathlib import Path
         
         out_path = Path(output_dir) if output_dir else None
@@ -681,20 +731,15 @@ class BacktestCLI:
                 return {'success': False, 'error': "No signatures found"}
             
             # Get all open tickers
-            all_open = set()
-            for sig in sigs:
-                all_open.update(sig.get_open_tickers())
+            all_open = {ticker for sig in sigs
+                        for ticker, pos in sig.positions.items() if pos.status == "open"}
             
             current_prices = self.prices.get_current_prices(list(all_open)) if all_open else {}
             
-            # Generate index
-            index_path = save_signatures_index(sigs, current_prices, out_path)
+            # Individual reports across worker processes, then the index
+            index_path = save_reports_batch(sigs, current_prices, out_path)
             print(f"✅ Index saved: {index_path}")
             
-            # Generate individual reports
-            for sig in sigs:
-                filepath = save_report(sig, current_prices, out_path)
-            
             print(f"✅ Generated {len(sigs)} reports")
             return {'success': True, 'count': len(sigs), 'index': str(index_path)}
     
@@ -782,6 +827,8 @@ Examples:
     p_process.add_argument('file', help='Path to scanner output file')
     p_process.add_argument('-m', '--mode', choices=['strong', 'early', 'all', 'dividend'],
                            default='all', help='Trading mode')
+    p_process.add_argument('--legacy-parser', action='store_true',
+                           help='Parse HTML with BeautifulSoup instead of lxml')
     
     # signatures
     p_sigs = subparsers.add_parser('signatures', help='List all signatures')
@@ -835,7 +882,7 @@ Examples:
     cli = BacktestCLI()
     
     if args.command == 'process':
-        cli.cmd_process(args.file, args.mode)
+        cli.cmd_process(args.file, args.mode, args.legacy_parser)
     
     elif args.command == 'signatures':
         print(cli.cmd_signatures(args.mode, args.limit))
@@ -3,9 +3,10 @@ Configuration for PSAR Backtesting System
 """
 
 import os
+import time as time_module
 from pathlib import Path
 from datetime import datetime, time
-import pytz
+from zoneinfo import ZoneInfo
 
 # Project root
 PROJECT_ROOT = Path(__file__).parent.resolve()
@@ -16,10 +17,24 @@ SCANNER_DIR = Path(os.environ.get(
     PROJECT_ROOT.parent / 'market-psar-scanner'
 ))
 
+# Import the scanner's main.py and call its scan_tickers() directly instead
+# of running it as a subprocess (opt-in: it runs scanner code inside bt.py)
+SCANNER_IN_PROCESS = os.environ.get('SCANNER_IN_PROCESS', '').lower() in ('1', 'true', 'yes')
+
 # Data storage
 DATA_DIR = PROJECT_ROOT / 'data'
 RUNS_DIR = DATA_DIR / 'runs'
 SIGNATURES_FILE = DATA_DIR / 'signatures.json'
+PRICES_CACHE_FILE = DATA_DIR / 'prices_cache.db'
+
+# How long a cached current price stays fresh (seconds)
+QUOTE_TTL_OPEN = 30        # Market open: prices move, keep it short
+QUOTE_TTL_CLOSED = 3600    # Market closed: last close doesn't change
+
+# Scanner sell checks are reused for the same tickers within this many
+# seconds (and until the scanner's main.py changes)
+SELL_CACHE_FILE = DATA_DIR / 'sell_cache.json'
+SELL_CACHE_TTL = 60
 
 # Portfolio positions (from Fidelity export)
 # This file contains actual cost basis for P&L calculations
@@ -33,10 +48,15 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 RUNS_DIR.mkdir(parents=True, exist_ok=True)
 
 # Market hours (US Eastern)
-MARKET_TZ = pytz.timezone('US/Eastern')
+MARKET_TZ = ZoneInfo('America/New_York')
 MARKET_OPEN = time(9, 30)
 MARKET_CLOSE = time(16, 0)
 
+# get_market_status() is called from several places per command; reuse the
+# last result for this many seconds
+_STATUS_TTL = 1.0
+_STATUS_CACHE = {'t': 0.0, 'v': None}
+
 
 def get_market_status() -> dict:
     """
@@ -48,6 +68,18 @@ def get_market_status() -> dict:
             - price_type: 'open', 'close', 'previous_close'
             - reference_date: date to use for prices
     """
+    now_mono = time_module.monotonic()
+    if _STATUS_CACHE['v'] is not None and now_mono - _STATUS_CACHE['t'] < _STATUS_TTL:
+        return dict(_STATUS_CACHE['v'])
+    
+    status = _compute_market_status()
+    _STATUS_CACHE['t'] = now_mono
+    _STATUS_CACHE['v'] = status
+    return dict(status)
+
+
+def _compute_market_status() -> dict:
+    """Market status for the current wall-clock time (uncached)"""
     now_et = datetime.now(MARKET_TZ)
     current_time = now_et.time()
     current_date = now_et.date()
@@ -12,10 +12,112 @@ Supports V2 scanner output format with sections:
 - 🔴 SELL
 """
 
+import html
+import os
 import re
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
-from bs4 import BeautifulSoup
+from typing import Dict, List, Optional, Union
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # parse_content_fast falls back to BeautifulSoup
+    lxml_html = None
+
+# BeautifulSoup tree builder: lxml's C parser when installed
+BS4_PARSER = 'lxml' if lxml_html is not None else 'html.parser'
+
+# _parse_html only looks at these tags; everything else is never built
+_STRAINER = SoupStrainer(['tr', 'td', 'strong', 'div', 'table'])
+
+if lxml_html is not None:
+    # Ticker source for a row: first <strong> of the first cell, or the
+    # whole first cell when it has no <strong>
+    _TICKER_NODE_XPATH = etree.XPath(
+        '((descendant::td)[1]/descendant::strong)[1]'
+        ' | (descendant::td)[1][not(descendant::strong)]'
+    )
+    # First table after a section div opens, in document order
+    _NEXT_TABLE_XPATH = etree.XPath('(descendant::table | following::table)[1]')
+
+# Compiled once for the per-line / per-cell loops
+_TICKER_RE = re.compile(r'^([A-Z]{1,5})(?:\s|$|[^A-Z])')
+_WORD_RE = re.compile(r'[⭐]?\b([A-Z]{1,5})\b')
+
+# Markers that identify scanner output as HTML
+_HTML_TAG_RE = re.compile(r'<(?:html|table|!doctype)', re.IGNORECASE)
+
+# Characters _extract_ticker strips: stars plus every whitespace char
+# (what \s matches; the highest is U+3000 ideographic space)
+_STRIP_TABLE = str.maketrans('', '', '⭐★☆' + ''.join(
+    c for c in map(chr, range(0x3001)) if c.isspace()
+))
+
+# Regex stream parser for simple, well-formed scanner HTML (see
+# _parse_html_stream); anything it can't vouch for goes to lxml instead
+_TR_OPEN_RE = re.compile(r'<tr\b', re.IGNORECASE)
+_ROW_RE = re.compile(r'<tr\b([^>]*)>(.*?)</tr\s*>', re.IGNORECASE | re.DOTALL)
+_DIV_TAG_RE = re.compile(r'<div\b([^>]*)>', re.IGNORECASE)
+_TABLE_TAG_RE = re.compile(r'<(/?)table\b', re.IGNORECASE)
+_CLASS_ATTR_RE = re.compile(
+    r'''\bclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''', re.IGNORECASE
+)
+_FIRST_TD_RE = re.compile(r'<td\b[^>]*>(.*?)</td\s*>', re.IGNORECASE | re.DOTALL)
+_STRONG_RE = re.compile(r'<strong\b[^>]*>(.*?)</strong\s*>', re.IGNORECASE | re.DOTALL)
+_CELL_TAG_RE = re.compile(r'<t[dhr]\b|<strong\b', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]*>')
+_STREAM_UNSAFE_RE = re.compile(
+    r'<!--|<!\[CDATA\[|<script\b|<textarea\b|<template\b',
+    re.IGNORECASE
+)
+
+# Any plain-text section header contains at least one of these
+_SECTION_HINT_RE = re.compile('BUY|SELL|HOLD|DIVIDEND|💰')
+
+# Common words that look like tickers in plain text output
+_EXCLUDED_WORDS = frozenset({
+    'BUY', 'SELL', 'HOLD', 'STRONG', 'EARLY', 'DIVIDEND', 'TIER', 'TOP',
+    'PSAR', 'RSI', 'OBV', 'DMI', 'ADX', 'MACD', 'PRSI', 'ATR', 'SBI',
+    'THE', 'AND', 'FOR', 'WITH', 'FROM', 'INTO', 'ZONE', 'SIGNAL',
+    'PRICE', 'DAYS', 'STOCKS', 'MODE', 'MARKET', 'SCAN', 'REPORT',
+    'SECTION', 'CONFIRMED', 'FRESH', 'SIGNALS', 'POSITIONS',
+    'TICKER', 'YIELD', 'OPEN', 'CLOSE', 'HIGH', 'LOW', 'VOLUME',
+    'PRIMARY', 'LOGIC', 'TREND', 'SCORE', 'ALIGNMENT', 'ACCUMULATION',
+    'BUYS', 'SELLS', 'HOLDS', 'FILTER', 'FILTERS', 'SCANNED', 'ANALYZED',
+    'TRUE', 'FALSE', 'NULL', 'NONE', 'CLASS', 'STYLE', 'DIV', 'TABLE',
+    'COLOR', 'WHITE', 'GREEN', 'RED', 'BLUE', 'BACKGROUND', 'PADDING',
+    'MARGIN', 'FONT', 'SIZE', 'WEIGHT', 'BOLD', 'BORDER', 'LEFT'
+})
+
+# Column headers that show up as the first cell of a table row
+_HEADER_WORDS = frozenset({'TICKER', 'SYMBOL', 'STOCK', 'NAME', 'PRICE'})
+
+# Words _extract_ticker never returns as a ticker
+_NOT_TICKER = frozenset({'THE', 'AND', 'FOR', 'BUY', 'SELL'})
+
+
+# Map CSS classes to categories (V2 scanner format)
+# Header rows use classes like 'th-strongbuy', 'th-earlybuy', etc.
+CSS_CLASS_MAP = {
+    'th-strongbuy': 'strong_buys',
+    'th-earlybuy': 'early_buys',
+    'th-buy': 'buys',
+    'th-dividend': 'dividends',
+    'th-hold': 'holds',
+    'th-sell': 'sells',
+    'section-strongbuy': 'strong_buys',
+    'section-earlybuy': 'early_buys',
+    'section-buy': 'buys',
+    'section-dividend': 'dividends',
+    'section-hold': 'holds',
+    'section-sell': 'sells',
+}
+
+# Header class names, for a single C-level isdisjoint() test per element
+_HEADER_CLASSES = frozenset(CSS_CLASS_MAP)
 
 
 def parse_file(filepath: str) -> Dict[str, List[str]]:
@@ -27,9 +129,46 @@ def parse_file(filepath: str) -> Dict[str, List[str]]:
     
     Returns:
         Dict with keys: strong_buys, buys, early_buys, dividends, holds, sells
+    
+    Results are cached per (path, mtime, size), so re-parsing an unchanged
+    file is free. Each call gets its own copy of the lists.
+    """
+    st = os.stat(filepath)
+    parsed = _parse_file_cached(os.path.abspath(filepath), st.st_mtime_ns, st.st_size)
+    return {k: list(v) for k, v in parsed.items()}
+
+
+def parse_files(paths: List[str]) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Parse several scanner output files concurrently.
+    
+    Returns dict of path -> parse_file() result. Threads help where the
+    work happens in lxml's C parser (HTML), which releases the GIL; plain
+    text parsing is pure Python, so text-heavy batches gain little and are
+    better served by a process pool.
     """
-    with open(filepath, encoding='utf-8') as f:
-        content = f.read()
+    if not paths:
+        return {}
+    
+    workers = min(8, os.cpu_count() or 1, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return dict(zip(paths, ex.map(parse_file, paths)))
+
+
+@lru_cache(maxsize=64)
+def _parse_file_cached(filepath: str, mtime_ns: int, size: int) -> Dict[str, List[str]]:
+    """Read and parse a file; mtime/size only key the cache"""
+    with open(filepath, 'rb', buffering=1 << 20) as f:
+        data = f.read()
+    
+    # HTML is handed to the parser as bytes and decoded once, inside lxml
+    if _looks_like_html(data[:4096].decode('utf-8', errors='ignore')):
+        return _parse_html(data)
+    
+    content = data.decode('utf-8', errors='replace')
+    if '\r' in content:
+        # Match text-mode reads (universal newlines)
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
     
     return parse_content(content)
 
@@ -42,15 +181,69 @@ def parse_content(content: str) -> Dict[str, List[str]]:
         Dict with keys: strong_buys, buys, early_buys, dividends, holds, sells
     """
     # Check if HTML
-    if '<html' in content.lower() or '<table' in content.lower():
+    if _looks_like_html(content):
         return _parse_html(content)
     else:
         return _parse_text(content)
 
 
-def _parse_html(content: str) -> Dict[str, List[str]]:
-    """Parse HTML scanner output"""
-    soup = BeautifulSoup(content, 'html.parser')
+def _looks_like_html(content: str) -> bool:
+    """Detect HTML from the first few KB, only scanning further if needed"""
+    head = content[:4096].lower()
+    if '<html' in head or '<table' in head or '<!doctype' in head:
+        return True
+    # Case-insensitive search instead of lowercasing a copy of the rest
+    return len(content) > 4096 and _HTML_TAG_RE.search(content, 4096 - 8) is not None
+
+
+def parse_content_fast(content: str) -> Dict[str, List[str]]:
+    """
+    Parse scanner output content using lxml directly for HTML.
+    
+    Same result as parse_content(), but HTML goes through lxml's C parser
+    and tree instead of BeautifulSoup's Python object model. Simple,
+    well-formed scanner tables skip tree building entirely via
+    _parse_html_stream(). Falls back to parse_content() when lxml is not
+    installed.
+    """
+    if lxml_html is None:
+        return parse_content(content)
+    
+    if _looks_like_html(content):
+        result = _parse_html_stream(content)
+        return result if result is not None else _parse_html_lxml(content)
+    else:
+        return _parse_text(content)
+
+
+def _html_classes(attrs: str) -> List[str]:
+    """Class names from a tag's attribute string"""
+    m = _CLASS_ATTR_RE.search(attrs)
+    if not m:
+        return []
+    return (m.group(1) or m.group(2) or m.group(3) or '').split()
+
+
+def _parse_html_stream(content: str) -> Optional[Dict[str, List[str]]]:
+    """
+    Parse simple scanner HTML with regexes only, no DOM.
+    
+    Produces the same result as _parse_html_lxml for flat, well-formed
+    tables (every <tr> closed, no nested tables, no comments or scripts).
+    Returns None when the markup is outside that envelope or has no
+    section markers, so the caller can fall back to a real parser.
+    """
+    if _STREAM_UNSAFE_RE.search(content):
+        return None
+    
+    row_matches = list(_ROW_RE.finditer(content))
+    if not row_matches or len(row_matches) != len(_TR_OPEN_RE.findall(content)):
+        return None  # unclosed or stray <tr> tags
+    
+    # Tables must be flat: strictly alternating open/close tags
+    table_tags = [(m.start(), m.group(1)) for m in _TABLE_TAG_RE.finditer(content)]
+    if [closing for _, closing in table_tags] != ['', '/'] * (len(table_tags) // 2):
+        return None
     
     result = {
         'strong_buys': [],
@@ -60,35 +253,174 @@ def _parse_html(content: str) -> Dict[str, List[str]]:
         'holds': [],
         'sells': []
     }
+    seen = {k: set() for k in result}  # fast membership, result keeps order
+    
+    # Every row must sit inside a table
+    table_opens = [pos for pos, closing in table_tags if not closing]
+    table_closes = [pos for pos, closing in table_tags if closing]
+    row_starts = [m.start() for m in row_matches]
+    for pos in row_starts:
+        i = bisect_right(table_opens, pos) - 1
+        if i < 0 or pos > table_closes[i]:
+            return None
+    
+    # Ticker candidate of each row: first cell's <strong>, or the whole cell
+    rows = [m.groups() for m in row_matches]
+    row_tickers = []
+    for _, body in rows:
+        lower = body.lower()
+        if '<tr' in lower:
+            return None  # a row opened inside another row
+        
+        ticker = None
+        if '<td' in lower:
+            # First cell must be explicitly closed, with at most one
+            # closed <strong> in it; otherwise leave it to lxml
+            cell = _FIRST_TD_RE.search(body)
+            if not cell:
+                return None
+            text = cell.group(1)
+            if '<' in text:
+                strong = _STRONG_RE.search(text)
+                if strong:
+                    text = strong.group(1)
+                if _CELL_TAG_RE.search(text) or (not strong and '<strong' in text.lower()):
+                    return None
+                text = _TAG_RE.sub('', text)
+            if '&' in text:
+                text = html.unescape(text)
+            ticker = _extract_ticker(text.strip())
+        row_tickers.append(ticker)
+    
+    def add(ticker, section):
+        # Skip common header words
+        if ticker and ticker not in seen[section] and ticker not in _HEADER_WORDS:
+            seen[section].add(ticker)
+            result[section].append(ticker)
+    
+    # Table rows: header rows switch the current section
+    found_section = False
+    current_section = None
+    for (attrs, _), ticker in zip(rows, row_tickers):
+        classes = _html_classes(attrs) if attrs else ()
+        if not _HEADER_CLASSES.isdisjoint(classes):
+            for css_class in classes:
+                if css_class in CSS_CLASS_MAP:
+                    current_section = CSS_CLASS_MAP[css_class]
+                    found_section = True
+        
+        if current_section:
+            add(ticker, current_section)
+    
+    # Section divs followed by a table (backup method)
+    for div in _DIV_TAG_RE.finditer(content):
+        for css_class in _html_classes(div.group(1)):
+            if css_class in CSS_CLASS_MAP:
+                found_section = True
+                i = bisect_left(table_opens, div.end())
+                if i == len(table_opens):
+                    continue
+                first = bisect_left(row_starts, table_opens[i])
+                last = bisect_right(row_starts, table_closes[i])
+                for ticker in row_tickers[first:last]:
+                    add(ticker, CSS_CLASS_MAP[css_class])
     
-    # Map CSS classes to categories (V2 scanner format)
-    # Header rows use classes like 'th-strongbuy', 'th-earlybuy', etc.
-    css_class_map = {
-        'th-strongbuy': 'strong_buys',
-        'th-earlybuy': 'early_buys',
-        'th-buy': 'buys',
-        'th-dividend': 'dividends',
-        'th-hold': 'holds',
-        'th-sell': 'sells',
-        'section-strongbuy': 'strong_buys',
-        'section-earlybuy': 'early_buys',
-        'section-buy': 'buys',
-        'section-dividend': 'dividends',
-        'section-hold': 'holds',
-        'section-sell': 'sells',
+    return result if found_section else None
+
+
+def _parse_html_lxml(content: str) -> Dict[str, List[str]]:
+    """Parse HTML scanner output with lxml (mirrors _parse_html)"""
+    tree = lxml_html.fromstring(content)
+    
+    result = {
+        'strong_buys': [],
+        'buys': [],
+        'early_buys': [],
+        'dividends': [],
+        'holds': [],
+        'sells': []
+    }
+    seen = {k: set() for k in result}  # fast membership, result keeps order
+    
+    def add_tickers(rows, section):
+        # Ticker is in the first cell, usually inside <strong>
+        section_seen = seen[section]
+        tickers = result[section]
+        for tr in rows:
+            nodes = _TICKER_NODE_XPATH(tr)
+            if not nodes:
+                continue
+            ticker = _extract_ticker(nodes[0].text_content().strip())
+            
+            # Skip common header words
+            if ticker and ticker not in section_seen and ticker not in _HEADER_WORDS:
+                section_seen.add(ticker)
+                tickers.append(ticker)
+    
+    # Classify rows first: header rows switch the current section, and each
+    # row from a header on is queued under that section
+    rows_by_section = {k: [] for k in result}
+    current_section = None
+    for tr in tree.iter('tr'):
+        classes = tr.get('class', '').split()
+        if not _HEADER_CLASSES.isdisjoint(classes):
+            for css_class in classes:
+                if css_class in CSS_CLASS_MAP:
+                    current_section = CSS_CLASS_MAP[css_class]
+        
+        if current_section:
+            rows_by_section[current_section].append(tr)
+    
+    # Then extract tickers section by section
+    for section, rows in rows_by_section.items():
+        add_tickers(rows, section)
+    
+    # Section divs followed by a table (backup method)
+    for div in tree.iter('div'):
+        for css_class in div.get('class', '').split():
+            if css_class in CSS_CLASS_MAP:
+                tables = _NEXT_TABLE_XPATH(div)
+                if tables:
+                    add_tickers(tables[0].iter('tr'), CSS_CLASS_MAP[css_class])
+    
+    return result
+
+
+def _parse_html(content: Union[str, bytes]) -> Dict[str, List[str]]:
+    """Parse HTML scanner output (str, or UTF-8 bytes straight from disk)"""
+    encoding = 'utf-8' if isinstance(content, bytes) else None
+    soup = BeautifulSoup(content, BS4_PARSER, parse_only=_STRAINER, from_encoding=encoding)
+    
+    result = {
+        'strong_buys': [],
+        'buys': [],
+        'early_buys': [],
+        'dividends': [],
+        'holds': [],
+        'sells': []
     }
+    seen = {k: set() for k in result}  # fast membership, result keeps order
+    
+    css_class_map = CSS_CLASS_MAP
     
     current_section = None
+    section_divs = []
     
-    # Find all table rows
-    for tr in soup.find_all('tr'):
+    # One walk over rows and divs; section divs are handled after the rows
+    for tr in soup.find_all(['tr', 'div']):
+        if tr.name == 'div':
+            div = tr
+            if not _HEADER_CLASSES.isdisjoint(div.get('class', ())):
+                section_divs.append(div)
+            continue
+        
         tr_classes = tr.get('class', [])
         
         # Check if this is a section header row
-        for css_class in tr_classes:
-            if css_class in css_class_map:
-                current_section = css_class_map[css_class]
-                continue
+        if not _HEADER_CLASSES.isdisjoint(tr_classes):
+            for css_class in tr_classes:
+                if css_class in css_class_map:
+                    current_section = css_class_map[css_class]
         
         # If we're in a section, extract ticker from first cell
         if current_section:
@@ -102,17 +434,15 @@ def _parse_html(content: str) -> Dict[str, List[str]]:
                 else:
                     ticker = _extract_ticker(first_cell.get_text().strip())
                 
-                if ticker and ticker not in result[current_section]:
+                if ticker and ticker not in seen[current_section]:
                     # Skip common header words
-                    if ticker not in ['TICKER', 'SYMBOL', 'STOCK', 'NAME', 'PRICE']:
+                    if ticker not in _HEADER_WORDS:
+                        seen[current_section].add(ticker)
                         result[current_section].append(ticker)
     
-    # Also check for section divs with text (backup method)
-    for div in soup.find_all('div'):
-        div_classes = div.get('class', [])
-        text = div.get_text().upper()
-        
-        for css_class in div_classes:
+    # Also check section divs for a following table (backup method)
+    for div in section_divs:
+        for css_class in div.get('class', []):
             if css_class in css_class_map:
                 # Found a section header div, look for table after it
                 table = div.find_next('table')
@@ -127,8 +457,9 @@ def _parse_html(content: str) -> Dict[str, List[str]]:
                             else:
                                 ticker = _extract_ticker(cells[0].get_text().strip())
                             
-                            if ticker and ticker not in result[section]:
-                                if ticker not in ['TICKER', 'SYMBOL', 'STOCK', 'NAME', 'PRICE']:
+                            if ticker and ticker not in seen[section]:
+                                if ticker not in _HEADER_WORDS:
+                                    seen[section].add(ticker)
                                     result[section].append(ticker)
     
     return result
@@ -144,30 +475,27 @@ def _parse_text(content: str) -> Dict[str, List[str]]:
         'holds': [],
         'sells': []
     }
-    
-    # Common words to exclude
-    excluded = {
-        'BUY', 'SELL', 'HOLD', 'STRONG', 'EARLY', 'DIVIDEND', 'TIER', 'TOP',
-        'PSAR', 'RSI', 'OBV', 'DMI', 'ADX', 'MACD', 'PRSI', 'ATR', 'SBI',
-        'THE', 'AND', 'FOR', 'WITH', 'FROM', 'INTO', 'ZONE', 'SIGNAL',
-        'PRICE', 'DAYS', 'STOCKS', 'MODE', 'MARKET', 'SCAN', 'REPORT',
-        'SECTION', 'CONFIRMED', 'FRESH', 'SIGNALS', 'POSITIONS',
-        'TICKER', 'YIELD', 'OPEN', 'CLOSE', 'HIGH', 'LOW', 'VOLUME',
-        'PRIMARY', 'LOGIC', 'TREND', 'SCORE', 'ALIGNMENT', 'ACCUMULATION',
-        'BUYS', 'SELLS', 'HOLDS', 'FILTER', 'FILTERS', 'SCANNED', 'ANALYZED',
-        'TRUE', 'FALSE', 'NULL', 'NONE', 'CLASS', 'STYLE', 'DIV', 'TABLE',
-        'COLOR', 'WHITE', 'GREEN', 'RED', 'BLUE', 'BACKGROUND', 'PADDING',
-        'MARGIN', 'FONT', 'SIZE', 'WEIGHT', 'BOLD', 'BORDER', 'LEFT'
-    }
+    # Lines collected per section; tickers are pulled out after the loop
+    section_lines = {k: [] for k in result}
     
     current_section = None
     
     for line in content.split('\n'):
         line_text = line.strip()
+        
+        # Blank lines and pure '====' / '----' rules can't be headers or
+        # hold tickers; skip them before making an uppercased copy
+        if not line_text or not line_text.strip('=-'):
+            continue
+        
         line_upper = line_text.upper()
         
-        # Detect section headers (check for CSS class names too)
-        if 'STRONG' in line_upper and 'BUY' in line_upper:
+        # Detect section headers (check for CSS class names too). Every
+        # header below contains one of the hint keywords, so ticker lines
+        # without any skip the whole cascade after a single regex scan.
+        if _SECTION_HINT_RE.search(line_upper) is None:
+            pass
+        elif 'STRONG' in line_upper and 'BUY' in line_upper:
             current_section = 'strong_buys'
             continue
         elif 'EARLY' in line_upper and 'BUY' in line_upper:
@@ -197,34 +525,45 @@ def _parse_text(content: str) -> Dict[str, List[str]]:
         # Skip header/separator lines
         if line_text.startswith('=') or line_text.startswith('-'):
             continue
-        if not line_text:
-            continue
         
-        # Extract tickers from current section
+        # Queue line for ticker extraction in the current section
         if current_section:
-            # Look for ticker patterns
-            # Tickers are typically 1-5 uppercase letters
-            words = re.findall(r'[⭐]?\b([A-Z]{1,5})\b', line_upper)
-            
-            for word in words:
-                if word not in excluded and len(word) >= 2:
-                    if word not in result[current_section]:
-                        result[current_section].append(word)
+            section_lines[current_section].append(line_upper)
+    
+    # One regex pass per section over all its lines (matches never span a
+    # newline, so this finds the same words as a per-line findall)
+    for section, lines in section_lines.items():
+        if not lines:
+            continue
+        
+        # Tickers are typically 1-5 uppercase letters. Filter and dedup in
+        # one pass: seen.add() returns None, so new words are kept.
+        seen = set()
+        result[section] = [
+            w for w in _WORD_RE.findall('\n'.join(lines))
+            if len(w) >= 2 and w not in _EXCLUDED_WORDS
+            and not (w in seen or seen.add(w))
+        ]
     
     return result
 
 
 def _extract_ticker(text: str) -> Optional[str]:
     """Extract ticker symbol from text (handles emoji stars, etc)"""
-    # Remove common non-ticker characters
-    cleaned = re.sub(r'[⭐★☆\s]', '', text)
+    # Plain ASCII without whitespace (the usual cell) has nothing to strip.
+    # For ASCII, isprintable() rules out every whitespace char but ' '.
+    if text.isascii() and text.isprintable() and ' ' not in text:
+        cleaned = text
+    else:
+        # Remove common non-ticker characters
+        cleaned = text.translate(_STRIP_TABLE)
     
     # Extract uppercase letters
-    match = re.match(r'^([A-Z]{1,5})(?:\s|$|[^A-Z])', cleaned.upper())
+    match = _TICKER_RE.match(cleaned.upper())
     if match:
         ticker = match.group(1)
         # Validate it's not a common word
-        if ticker not in {'THE', 'AND', 'FOR', 'BUY', 'SELL'}:
+        if ticker not in _NOT_TICKER:
             return ticker
     
     return None
@@ -263,14 +602,17 @@ def get_buy_tickers(parsed: Dict[str, List[str]], mode: str = 'all') -> List[str
     if mode == 'dividend':
         tickers.extend(parsed.get('dividends', []))
     
-    # Remove duplicates while preserving order
+    return _dedup_preserve_order(tickers)
+
+
+def _dedup_preserve_order(items: List[str]) -> List[str]:
+    """Remove duplicates while preserving first-seen order"""
     seen = set()
     unique = []
-    for t in tickers:
-        if t not in seen:
-            seen.add(t)
-            unique.append(t)
-    
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            unique.append(item)
     return unique
 
 
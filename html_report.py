@@ -4,262 +4,437 @@ HTML Report Generator
 Creates pretty HTML reports for sharing backtest results.
 """
 
+import hashlib
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from operator import attrgetter
+from statistics import fmean
 from typing import Dict, List, Optional
 from pathlib import Path
 
+import numpy as np
+
 from config import DATA_DIR
+from pnl import pnl_percent
+
+# Write buffer for report files
+_WRITE_BUFFER = 1 << 20
+
+# Rendering a report takes ~0.2 ms, while starting a process pool costs
+# ~30 ms with fork and ~600 ms with spawn (the Windows/macOS default), so
+# save_reports only uses a pool by default for at least this many reports
+_POOL_MIN_JOBS = 5000
+
+# Digests of the reports on disk, stored next to them
+_REPORT_CACHE_FILE = '.cache.json'
+
+# Modules whose code decides what a report looks like: this one, the P/L
+# helpers behind _compute_aggregates, and Signature.get_summary()
+_RENDER_MODULES = ('html_report.py', 'pnl.py', 'signatures.py')
+
+# Part of every report digest so that editing any of them re-renders reports
+_MODULE_STAMP = ':'.join(
+    str(Path(__file__).with_name(name).stat().st_mtime_ns) for name in _RENDER_MODULES
+).encode()
+
+
+# Escapes text for HTML element content and quoted attributes in one pass
+_HTML_ESC = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})
+
+# Display labels for position categories
+_CATEGORY_LABELS = {c: c.replace('_', ' ') for c in ('strong_buy', 'early_buy', 'buy', 'dividend')}
 
+# Table rows of the signature report
+_OpenRow = namedtuple('_OpenRow', 'ticker category entry_price entry_date current_price pnl_pct')
+_ClosedRow = namedtuple('_ClosedRow', 'ticker category entry_price entry_date '
+                                      'exit_price exit_date pnl_pct exit_reason')
 
-def generate_signature_report_html(signature, current_prices: Dict[str, float]) -> str:
+
+def _pnl_class(pnl: float) -> str:
+    """CSS class for a P/L value"""
+    return 'positive' if pnl > 0 else 'negative' if pnl < 0 else ''
+
+
+_Aggregates = namedtuple('_Aggregates', 'avg_unrealized avg_realized total_pnl n_open n_closed')
+
+
+def _compute_aggregates(signature, current_prices: Dict[str, float]) -> _Aggregates:
+    """
+    Equal-weighted P/L figures shown for a signature.
+    
+    Unrealized P/L averages the open positions that have a quote and a
+    valid entry price; realized P/L averages the closed positions with a
+    recorded P/L. The total weights the two averages by those counts.
+    """
+    quoted = [(pos.entry_price or 0, current_prices[ticker] or 0)
+              for ticker, pos in signature.positions.items()
+              if pos.status == "open" and ticker in current_prices]
+    prices = np.array(quoted, dtype=np.float64).reshape(-1, 2)
+    valid = (prices[:, 0] > 0) & (prices[:, 1] > 0)
+    open_pnls = pnl_percent(prices[:, 0], prices[:, 1])[valid]
+    
+    closed_pnls = [pos.pnl_pct for pos in signature.positions.values()
+                   if pos.status == "closed" and pos.pnl_pct is not None]
+    
+    n_open, n_closed = len(open_pnls), len(closed_pnls)
+    avg_unrealized = float(open_pnls.mean()) if n_open else 0
+    avg_realized = fmean(closed_pnls) if n_closed else 0
+    
+    total_positions = n_open + n_closed
+    if total_positions > 0:
+        total_pnl = (avg_unrealized * n_open + avg_realized * n_closed) / total_positions
+    else:
+        total_pnl = 0
+    
+    return _Aggregates(avg_unrealized, avg_realized, total_pnl, n_open, n_closed)
+
+
+# Static parts of the pages live at module level so they are built once per
+# process instead of once per report. The stylesheets are written next to the
+# reports by _ensure_css() and linked from every page.
+_REPORT_CSS = '''* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
+    background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
+    color: #e0e0e0;
+    min-height: 100vh;
+    padding: 20px;
+}
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+}
+.header {
+    background: rgba(255,255,255,0.05);
+    border-radius: 16px;
+    padding: 30px;
+    margin-bottom: 20px;
+    border: 1px solid rgba(255,255,255,0.1);
+}
+.header h1 {
+    font-size: 28px;
+    margin-bottom: 10px;
+    color: #fff;
+}
+.header .subtitle {
+    color: #888;
+    font-size: 14px;
+}
+.header .meta {
+    display: flex;
+    gap: 30px;
+    margin-top: 15px;
+    flex-wrap: wrap;
+}
+.header .meta-item {
+    display: flex;
+    flex-direction: column;
+}
+.header .meta-label {
+    font-size: 11px;
+    color: #666;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+.header .meta-value {
+    font-size: 16px;
+    color: #fff;
+    margin-top: 4px;
+}
+.stats-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+    gap: 15px;
+    margin-bottom: 20px;
+}
+.stat-card {
+    background: rgba(255,255,255,0.05);
+    border-radius: 12px;
+    padding: 20px;
+    border: 1px solid rgba(255,255,255,0.1);
+}
+.stat-card .label {
+    font-size: 12px;
+    color: #888;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+.stat-card .value {
+    font-size: 32px;
+    font-weight: bold;
+    margin-top: 8px;
+}
+.stat-card .sub {
+    font-size: 12px;
+    color: #666;
+    margin-top: 4px;
+}
+.positive { color: #00d4aa; }
+.negative { color: #ff6b6b; }
+.neutral { color: #ffd93d; }
+
+.section {
+    background: rgba(255,255,255,0.05);
+    border-radius: 16px;
+    padding: 20px;
+    margin-bottom: 20px;
+    border: 1px solid rgba(255,255,255,0.1);
+}
+.section h2 {
+    font-size: 18px;
+    margin-bottom: 15px;
+    display: flex;
+    align-items: center;
+    gap: 10px;
+}
+.section h2 .count {
+    background: rgba(255,255,255,0.1);
+    padding: 4px 12px;
+    border-radius: 20px;
+    font-size: 14px;
+    font-weight: normal;
+}
+
+table {
+    width: 100%;
+    border-collapse: collapse;
+}
+th {
+    text-align: left;
+    padding: 12px 15px;
+    font-size: 11px;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+    color: #666;
+    border-bottom: 1px solid rgba(255,255,255,0.1);
+}
+td {
+    padding: 15px;
+    border-bottom: 1px solid rgba(255,255,255,0.05);
+}
+tr:hover {
+    background: rgba(255,255,255,0.02);
+}
+.ticker {
+    font-weight: bold;
+    color: #fff;
+    font-size: 15px;
+}
+.category {
+    display: inline-block;
+    padding: 4px 10px;
+    border-radius: 6px;
+    font-size: 11px;
+    text-transform: uppercase;
+}
+.category.strong_buy { background: #1e8449; color: white; }
+.category.early_buy { background: #2980b9; color: white; }
+.category.buy { background: #27ae60; color: white; }
+.category.dividend { background: #8e44ad; color: white; }
+
+.price {
+    font-family: 'SF Mono', Monaco, monospace;
+}
+.pnl {
+    font-weight: bold;
+    font-size: 15px;
+}
+
+.footer {
+    text-align: center;
+    padding: 30px;
+    color: #666;
+    font-size: 12px;
+}
+
+@media (max-width: 768px) {
+    .stats-grid {
+        grid-template-columns: repeat(2, 1fr);
+    }
+    table {
+        font-size: 13px;
+    }
+    td, th {
+        padding: 10px 8px;
+    }
+}
+'''
+
+_REPORT_HEAD_START = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Backtest Report - '''
+
+_REPORT_HEAD_END = '''</title>
+    <link rel="stylesheet" href="report.css">
+</head>
+<body>
+'''
+
+_INDEX_CSS = '''* { margin: 0; padding: 0; box-sizing: border-box; }
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+    background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
+    color: #e0e0e0;
+    min-height: 100vh;
+    padding: 20px;
+}
+.container { max-width: 1400px; margin: 0 auto; }
+h1 { 
+    font-size: 28px; 
+    margin-bottom: 20px;
+    color: #fff;
+}
+.grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
+    gap: 20px;
+}
+.card {
+    background: rgba(255,255,255,0.05);
+    border-radius: 16px;
+    padding: 20px;
+    border: 1px solid rgba(255,255,255,0.1);
+    transition: transform 0.2s, border-color 0.2s;
+    cursor: pointer;
+    text-decoration: none;
+    color: inherit;
+    display: block;
+}
+.card:hover {
+    transform: translateY(-2px);
+    border-color: rgba(255,255,255,0.2);
+}
+.card-header {
+    display: flex;
+    justify-content: space-between;
+    align-items: flex-start;
+    margin-bottom: 15px;
+}
+.card-id {
+    font-family: 'SF Mono', Monaco, monospace;
+    font-size: 12px;
+    color: #888;
+}
+.card-mode {
+    padding: 4px 10px;
+    border-radius: 6px;
+    font-size: 11px;
+    text-transform: uppercase;
+}
+.card-mode.strong { background: #1e8449; }
+.card-mode.early { background: #2980b9; }
+.card-mode.all { background: #8e44ad; }
+.card-mode.dividend { background: #f39c12; }
+.card-date {
+    font-size: 14px;
+    color: #aaa;
+    margin-bottom: 15px;
+}
+.card-stats {
+    display: grid;
+    grid-template-columns: repeat(3, 1fr);
+    gap: 10px;
+}
+.stat {
+    text-align: center;
+    padding: 10px;
+    background: rgba(0,0,0,0.2);
+    border-radius: 8px;
+}
+.stat-value {
+    font-size: 20px;
+    font-weight: bold;
+}
+.stat-label {
+    font-size: 10px;
+    color: #666;
+    text-transform: uppercase;
+    margin-top: 4px;
+}
+.positive { color: #00d4aa; }
+.negative { color: #ff6b6b; }
+.footer {
+    text-align: center;
+    padding: 30px;
+    color: #666;
+    font-size: 12px;
+}
+'''
+
+_INDEX_HEAD = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Backtest Signatures</title>
+    <link rel="stylesheet" href="index.css">
+</head>
+'''
+
+
+def generate_signature_report_html(signature, current_prices: Dict[str, float],
+                                   summary: Optional[dict] = None,
+                                   aggregates: Optional[_Aggregates] = None) -> str:
     """
     Generate a pretty HTML report for a signature.
     
     Args:
         signature: Signature object
         current_prices: Dict of ticker -> current price
+        summary: Precomputed signature.get_summary() (computed if omitted)
+        aggregates: Precomputed _compute_aggregates() (computed if omitted)
     
     Returns:
         HTML string
     """
-    summary = signature.get_summary()
+    if summary is None:
+        summary = signature.get_summary()
+    
+    agg = aggregates or _compute_aggregates(signature, current_prices)
     
-    # Calculate unrealized P/L (equal-weighted: average of all position returns)
-    open_pnls = []
-    open_positions = []
+    open_list = []
     closed_positions = []
     
     for ticker, pos in signature.positions.items():
         if pos.status == "open":
-            current = current_prices.get(ticker, pos.entry_price)
-            # Skip positions with invalid prices
-            if pos.entry_price and pos.entry_price > 0 and current and current > 0:
-                pnl = ((current - pos.entry_price) / pos.entry_price) * 100
-                open_pnls.append(pnl)
-            else:
-                pnl = 0.0  # Can't calculate P/L
-            open_positions.append({
-                'ticker': ticker,
-                'category': pos.category,
-                'entry_price': pos.entry_price or 0,
-                'entry_date': pos.entry_date,
-                'current_price': current or 0,
-                'pnl_pct': pnl
-            })
+            open_list.append((ticker, pos, current_prices.get(ticker, pos.entry_price) or 0))
         else:
-            closed_positions.append({
-                'ticker': ticker,
-                'category': pos.category,
-                'entry_price': pos.entry_price or 0,
-                'entry_date': pos.entry_date,
-                'exit_price': pos.exit_price,
-                'exit_date': pos.exit_date,
-                'pnl_pct': pos.pnl_pct or 0,
-                'exit_reason': pos.exit_reason
-            })
-    
-    # Equal-weighted average P/L
-    avg_unrealized = sum(open_pnls) / len(open_pnls) if open_pnls else 0
+            closed_positions.append(_ClosedRow(
+                ticker, pos.category, pos.entry_price or 0, pos.entry_date,
+                pos.exit_price, pos.exit_date or '', pos.pnl_pct or 0, pos.exit_reason))
     
-    # Sort
-    open_positions.sort(key=lambda x: x['pnl_pct'], reverse=True)
-    closed_positions.sort(key=lambda x: x['exit_date'] or '', reverse=True)
+    n_open = len(open_list)
+    entries = np.fromiter((pos.entry_price or 0 for _, pos, _ in open_list),
+                          dtype=np.float64, count=n_open)
+    currents = np.fromiter((current for _, _, current in open_list),
+                           dtype=np.float64, count=n_open)
+    # Rows with invalid prices show 0%
+    pnls = pnl_percent(entries, currents)
     
-    # Calculate realized P/L as average too
-    closed_pnls = [p['pnl_pct'] for p in closed_positions]
-    avg_realized = sum(closed_pnls) / len(closed_pnls) if closed_pnls else 0
+    open_positions = [
+        _OpenRow(ticker, pos.category, pos.entry_price or 0, pos.entry_date, current, pnl)
+        for (ticker, pos, current), pnl in zip(open_list, pnls.tolist())]
     
-    # Total P/L: weighted average based on position counts
-    total_positions = len(open_positions) + len(closed_positions)
-    if total_positions > 0:
-        total_pnl = (avg_unrealized * len(open_positions) + avg_realized * len(closed_positions)) / total_positions
-    else:
-        total_pnl = 0
+    # Sort
+    open_positions.sort(key=attrgetter('pnl_pct'), reverse=True)
+    closed_positions.sort(key=attrgetter('exit_date'), reverse=True)
     
-    html = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Backtest Report - {signature.signature_id}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            color: #e0e0e0;
-            min-height: 100vh;
-            padding: 20px;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-        }}
-        .header {{
-            background: rgba(255,255,255,0.05);
-            border-radius: 16px;
-            padding: 30px;
-            margin-bottom: 20px;
-            border: 1px solid rgba(255,255,255,0.1);
-        }}
-        .header h1 {{
-            font-size: 28px;
-            margin-bottom: 10px;
-            color: #fff;
-        }}
-        .header .subtitle {{
-            color: #888;
-            font-size: 14px;
-        }}
-        .header .meta {{
-            display: flex;
-            gap: 30px;
-            margin-top: 15px;
-            flex-wrap: wrap;
-        }}
-        .header .meta-item {{
-            display: flex;
-            flex-direction: column;
-        }}
-        .header .meta-label {{
-            font-size: 11px;
-            color: #666;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-        .header .meta-value {{
-            font-size: 16px;
-            color: #fff;
-            margin-top: 4px;
-        }}
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-            margin-bottom: 20px;
-        }}
-        .stat-card {{
-            background: rgba(255,255,255,0.05);
-            border-radius: 12px;
-            padding: 20px;
-            border: 1px solid rgba(255,255,255,0.1);
-        }}
-        .stat-card .label {{
-            font-size: 12px;
-            color: #888;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-        .stat-card .value {{
-            font-size: 32px;
-            font-weight: bold;
-            margin-top: 8px;
-        }}
-        .stat-card .sub {{
-            font-size: 12px;
-            color: #666;
-            margin-top: 4px;
-        }}
-        .positive {{ color: #00d4aa; }}
-        .negative {{ color: #ff6b6b; }}
-        .neutral {{ color: #ffd93d; }}
-        
-        .section {{
-            background: rgba(255,255,255,0.05);
-            border-radius: 16px;
-            padding: 20px;
-            margin-bottom: 20px;
-            border: 1px solid rgba(255,255,255,0.1);
-        }}
-        .section h2 {{
-            font-size: 18px;
-            margin-bottom: 15px;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-        .section h2 .count {{
-            background: rgba(255,255,255,0.1);
-            padding: 4px 12px;
-            border-radius: 20px;
-            font-size: 14px;
-            font-weight: normal;
-        }}
-        
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-        }}
-        th {{
-            text-align: left;
-            padding: 12px 15px;
-            font-size: 11px;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            color: #666;
-            border-bottom: 1px solid rgba(255,255,255,0.1);
-        }}
-        td {{
-            padding: 15px;
-            border-bottom: 1px solid rgba(255,255,255,0.05);
-        }}
-        tr:hover {{
-            background: rgba(255,255,255,0.02);
-        }}
-        .ticker {{
-            font-weight: bold;
-            color: #fff;
-            font-size: 15px;
-        }}
-        .category {{
-            display: inline-block;
-            padding: 4px 10px;
-            border-radius: 6px;
-            font-size: 11px;
-            text-transform: uppercase;
-        }}
-        .category.strong_buy {{ background: #1e8449; color: white; }}
-        .category.early_buy {{ background: #2980b9; color: white; }}
-        .category.buy {{ background: #27ae60; color: white; }}
-        .category.dividend {{ background: #8e44ad; color: white; }}
-        
-        .price {{
-            font-family: 'SF Mono', Monaco, monospace;
-        }}
-        .pnl {{
-            font-weight: bold;
-            font-size: 15px;
-        }}
-        
-        .footer {{
-            text-align: center;
-            padding: 30px;
-            color: #666;
-            font-size: 12px;
-        }}
-        
-        @media (max-width: 768px) {{
-            .stats-grid {{
-                grid-template-columns: repeat(2, 1fr);
-            }}
-            table {{
-                font-size: 13px;
-            }}
-            td, th {{
-                padding: 10px 8px;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
+    signature_id = signature.signature_id.translate(_HTML_ESC)
+    parts = [_REPORT_HEAD_START, signature_id, _REPORT_HEAD_END]
+    parts.append(f'''    <div class="container">
         <div class="header">
             <h1>📊 Backtest Report</h1>
-            <div class="subtitle">{signature.signature_id}</div>
+            <div class="subtitle">{signature_id}</div>
             <div class="meta">
                 <div class="meta-item">
                     <span class="meta-label">Created</span>
@@ -267,15 +442,15 @@ def generate_signature_report_html(signature, current_prices: Dict[str, float])
                 </div>
                 <div class="meta-item">
                     <span class="meta-label">Mode</span>
-                    <span class="meta-value">{signature.mode.upper()}</span>
+                    <span class="meta-value">{signature.mode.upper().translate(_HTML_ESC)}</span>
                 </div>
                 <div class="meta-item">
                     <span class="meta-label">Market</span>
-                    <span class="meta-value">{signature.market_status}</span>
+                    <span class="meta-value">{signature.market_status.translate(_HTML_ESC)}</span>
                 </div>
                 <div class="meta-item">
                     <span class="meta-label">Source</span>
-                    <span class="meta-value">{signature.source_file}</span>
+                    <span class="meta-value">{signature.source_file.translate(_HTML_ESC)}</span>
                 </div>
             </div>
         </div>
@@ -283,17 +458,17 @@ def generate_signature_report_html(signature, current_prices: Dict[str, float])
         <div class="stats-grid">
             <div class="stat-card">
                 <div class="label">Total P/L</div>
-                <div class="value {'positive' if total_pnl > 0 else 'negative' if total_pnl < 0 else ''}">{total_pnl:+.2f}%</div>
+                <div class="value {_pnl_class(agg.total_pnl)}">{agg.total_pnl:+.2f}%</div>
                 <div class="sub">Equal-weighted average</div>
             </div>
             <div class="stat-card">
                 <div class="label">Realized P/L</div>
-                <div class="value {'positive' if avg_realized > 0 else 'negative' if avg_realized < 0 else ''}">{avg_realized:+.2f}%</div>
+                <div class="value {_pnl_class(agg.avg_realized)}">{agg.avg_realized:+.2f}%</div>
                 <div class="sub">{len(closed_positions)} closed trades</div>
             </div>
             <div class="stat-card">
                 <div class="label">Unrealized P/L</div>
-                <div class="value {'positive' if avg_unrealized > 0 else 'negative' if avg_unrealized < 0 else ''}">{avg_unrealized:+.2f}%</div>
+                <div class="value {_pnl_class(agg.avg_unrealized)}">{agg.avg_unrealized:+.2f}%</div>
                 <div class="sub">{len(open_positions)} open positions</div>
             </div>
             <div class="stat-card">
@@ -302,11 +477,11 @@ def generate_signature_report_html(signature, current_prices: Dict[str, float])
                 <div class="sub">{summary['win_count']}/{summary['closed_positions']} winners</div>
             </div>
         </div>
-'''
+''')
     
     # Open positions section
     if open_positions:
-        html += f'''
+        parts.append(f'''
         <div class="section">
             <h2>🟢 Open Positions <span class="count">{len(open_positions)}</span></h2>
             <table>
@@ -321,28 +496,30 @@ def generate_signature_report_html(signature, current_prices: Dict[str, float])
                     </tr>
                 </thead>
                 <tbody>
-'''
-        for pos in open_positions:
-            pnl_class = 'positive' if pos['pnl_pct'] > 0 else 'negative' if pos['pnl_pct'] < 0 else ''
-            html += f'''
+''')
+        for row in open_positions:
+            pnl_class = _pnl_class(row.pnl_pct)
+            category = row.category.translate(_HTML_ESC)
+            category_label = _CATEGORY_LABELS.get(row.category) or category.replace('_', ' ')
+            parts.append(f'''
                     <tr>
-                        <td class="ticker">{pos['ticker']}</td>
-                        <td><span class="category {pos['category']}">{pos['category'].replace('_', ' ')}</span></td>
-                        <td>{pos['entry_date']}</td>
-                        <td class="price">${pos['entry_price']:.2f}</td>
-                        <td class="price">${pos['current_price']:.2f}</td>
-                        <td class="pnl {pnl_class}">{pos['pnl_pct']:+.1f}%</td>
+                        <td class="ticker">{row.ticker.translate(_HTML_ESC)}</td>
+                        <td><span class="category {category}">{category_label}</span></td>
+                        <td>{row.entry_date}</td>
+                        <td class="price">${row.entry_price:.2f}</td>
+                        <td class="price">${row.current_price:.2f}</td>
+                        <td class="pnl {pnl_class}">{row.pnl_pct:+.1f}%</td>
                     </tr>
-'''
-        html += '''
+''')
+        parts.append('''
                 </tbody>
             </table>
         </div>
-'''
+''')
     
     # Closed positions section
     if closed_positions:
-        html += f'''
+        parts.append(f'''
         <div class="section">
             <h2>📉 Closed Positions <span class="count">{len(closed_positions)}</span></h2>
             <table>
@@ -359,180 +536,83 @@ def generate_signature_report_html(signature, current_prices: Dict[str, float])
                     </tr>
                 </thead>
                 <tbody>
-'''
-        for pos in closed_positions:
-            pnl_class = 'positive' if pos['pnl_pct'] > 0 else 'negative' if pos['pnl_pct'] < 0 else ''
-            html += f'''
+''')
+        for row in closed_positions:
+            pnl_class = _pnl_class(row.pnl_pct)
+            category = row.category.translate(_HTML_ESC)
+            category_label = _CATEGORY_LABELS.get(row.category) or category.replace('_', ' ')
+            exit_price_str = f"${row.exit_price:.2f}" if row.exit_price else "$0.00"
+            parts.append(f'''
                     <tr>
-                        <td class="ticker">{pos['ticker']}</td>
-                        <td><span class="category {pos['category']}">{pos['category'].replace('_', ' ')}</span></td>
-                        <td>{pos['entry_date']}</td>
-                        <td>{pos['exit_date'] or '-'}</td>
-                        <td class="price">${pos['entry_price']:.2f}</td>
-                        <td class="price">${pos['exit_price']:.2f if pos['exit_price'] else 0:.2f}</td>
-                        <td class="pnl {pnl_class}">{pos['pnl_pct']:+.1f}%</td>
-                        <td>{pos['exit_reason'] or '-'}</td>
+                        <td class="ticker">{row.ticker.translate(_HTML_ESC)}</td>
+                        <td><span class="category {category}">{category_label}</span></td>
+                        <td>{row.entry_date}</td>
+                        <td>{row.exit_date or '-'}</td>
+                        <td class="price">${row.entry_price:.2f}</td>
+                        <td class="price">{exit_price_str}</td>
+                        <td class="pnl {pnl_class}">{row.pnl_pct:+.1f}%</td>
+                        <td>{(row.exit_reason or '-').translate(_HTML_ESC)}</td>
                     </tr>
-'''
-        html += '''
+''')
+        parts.append('''
                 </tbody>
             </table>
         </div>
-'''
+''')
     
-    html += f'''
+    parts.append(f'''
         <div class="footer">
             Generated {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | PSAR Backtesting
         </div>
     </div>
 </body>
 </html>
-'''
+''')
     
-    return html
+    return ''.join(parts)
 
 
-def generate_signatures_list_html(signatures: List, current_prices: Dict[str, float]) -> str:
+def generate_signatures_list_html(signatures: List, current_prices: Dict[str, float],
+                                  summaries: Optional[Dict[str, dict]] = None,
+                                  aggregates: Optional[Dict[str, _Aggregates]] = None) -> str:
     """
     Generate HTML for signatures list view.
+    
+    summaries and aggregates map signature_id -> get_summary() /
+    _compute_aggregates() results; signatures missing from them are
+    computed here.
     """
-    html = '''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Backtest Signatures</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            color: #e0e0e0;
-            min-height: 100vh;
-            padding: 20px;
-        }
-        .container { max-width: 1400px; margin: 0 auto; }
-        h1 { 
-            font-size: 28px; 
-            margin-bottom: 20px;
-            color: #fff;
-        }
-        .grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-            gap: 20px;
-        }
-        .card {
-            background: rgba(255,255,255,0.05);
-            border-radius: 16px;
-            padding: 20px;
-            border: 1px solid rgba(255,255,255,0.1);
-            transition: transform 0.2s, border-color 0.2s;
-            cursor: pointer;
-            text-decoration: none;
-            color: inherit;
-            display: block;
-        }
-        .card:hover {
-            transform: translateY(-2px);
-            border-color: rgba(255,255,255,0.2);
-        }
-        .card-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 15px;
-        }
-        .card-id {
-            font-family: 'SF Mono', Monaco, monospace;
-            font-size: 12px;
-            color: #888;
-        }
-        .card-mode {
-            padding: 4px 10px;
-            border-radius: 6px;
-            font-size: 11px;
-            text-transform: uppercase;
-        }
-        .card-mode.strong { background: #1e8449; }
-        .card-mode.early { background: #2980b9; }
-        .card-mode.all { background: #8e44ad; }
-        .card-mode.dividend { background: #f39c12; }
-        .card-date {
-            font-size: 14px;
-            color: #aaa;
-            margin-bottom: 15px;
-        }
-        .card-stats {
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 10px;
-        }
-        .stat {
-            text-align: center;
-            padding: 10px;
-            background: rgba(0,0,0,0.2);
-            border-radius: 8px;
-        }
-        .stat-value {
-            font-size: 20px;
-            font-weight: bold;
-        }
-        .stat-label {
-            font-size: 10px;
-            color: #666;
-            text-transform: uppercase;
-            margin-top: 4px;
-        }
-        .positive { color: #00d4aa; }
-        .negative { color: #ff6b6b; }
-    </style>
-</head>
-<body>
+    if summaries is None:
+        summaries = {}
+    if aggregates is None:
+        aggregates = {}
+    
+    parts = [_INDEX_HEAD]
+    parts.append('''<body>
     <div class="container">
         <h1>📋 Backtest Signatures</h1>
         <div class="grid">
-'''
+''')
     
     for sig in signatures:
-        summary = sig.get_summary()
-        
-        # Calculate unrealized as average (equal-weighted)
-        open_pnls = []
-        for ticker, pos in sig.positions.items():
-            if pos.status == "open" and ticker in current_prices:
-                entry = pos.entry_price or 0
-                current = current_prices.get(ticker, 0)
-                if entry > 0 and current > 0:
-                    pnl = ((current - entry) / entry) * 100
-                    open_pnls.append(pnl)
+        summary = summaries.get(sig.signature_id) or sig.get_summary()
         
-        avg_unrealized = sum(open_pnls) / len(open_pnls) if open_pnls else 0
+        agg = aggregates.get(sig.signature_id) or _compute_aggregates(sig, current_prices)
         
-        # Calculate realized as average
-        closed_pnls = [pos.pnl_pct for pos in sig.positions.values() 
-                       if pos.status == "closed" and pos.pnl_pct is not None]
-        avg_realized = sum(closed_pnls) / len(closed_pnls) if closed_pnls else 0
-        
-        # Total P/L: weighted average
-        total_positions = len(open_pnls) + len(closed_pnls)
-        if total_positions > 0:
-            total_pnl = (avg_unrealized * len(open_pnls) + avg_realized * len(closed_pnls)) / total_positions
-        else:
-            total_pnl = 0
+        pnl_class = _pnl_class(agg.total_pnl)
+        signature_id = sig.signature_id.translate(_HTML_ESC)
+        mode = sig.mode.translate(_HTML_ESC)
         
-        pnl_class = 'positive' if total_pnl > 0 else 'negative' if total_pnl < 0 else ''
-        
-        html += f'''
-            <a href="report_{sig.signature_id}.html" class="card">
+        parts.append(f'''
+            <a href="report_{signature_id}.html" class="card">
                 <div class="card-header">
-                    <span class="card-id">{sig.signature_id}</span>
-                    <span class="card-mode {sig.mode}">{sig.mode}</span>
+                    <span class="card-id">{signature_id}</span>
+                    <span class="card-mode {mode}">{mode}</span>
                 </div>
-                <div class="card-date">📅 {sig.created_at[:10]} &nbsp; 📄 {sig.source_file}</div>
+                <div class="card-date">📅 {sig.created_at[:10]} &nbsp; 📄 {sig.source_file.translate(_HTML_ESC)}</div>
                 <div class="card-stats">
                     <div class="stat">
-                        <div class="stat-value {pnl_class}">{total_pnl:+.1f}%</div>
+                        <div class="stat-value {pnl_class}">{agg.total_pnl:+.1f}%</div>
                         <div class="stat-label">Total P/L</div>
                     </div>
                     <div class="stat">
@@ -545,53 +625,204 @@ def generate_signatures_list_html(signatures: List, current_prices: Dict[str, fl
                     </div>
                 </div>
             </a>
-'''
+''')
     
-    html += '''
+    # The index is rewritten on every run, unlike cached reports, so it
+    # carries the time of this run
+    parts.append(f'''
+        </div>
+        <div class="footer">
+            Generated {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | PSAR Backtesting
         </div>
     </div>
 </body>
 </html>
-'''
+''')
+    
+    return ''.join(parts)
+
+
+def _write_text(path: Path, text: str):
+    """
+    Write a page in one buffered call.
     
-    return html
+    UTF-8 regardless of locale (the pages contain emoji), no newline
+    translation, and a buffer large enough to hold a whole report.
+    """
+    with open(path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER, newline='') as f:
+        f.write(text)
+
+
+def _ensure_css(output_dir: Path):
+    """
+    Write report.css / index.css into output_dir.
+    
+    Files are only rewritten when missing or older than this module, so
+    regenerating reports normally leaves the stylesheets untouched.
+    """
+    module_mtime = Path(__file__).stat().st_mtime
+    for name, css in (('report.css', _REPORT_CSS), ('index.css', _INDEX_CSS)):
+        path = output_dir / name
+        try:
+            if path.stat().st_mtime >= module_mtime:
+                continue
+        except FileNotFoundError:
+            pass
+        _write_text(path, css)
+
+
+def _report_digest(signature, current_prices: Dict[str, float]) -> str:
+    """Hash of everything a signature's report is rendered from"""
+    prices = {t: current_prices.get(t) for t in signature.get_open_tickers()}
+    h = hashlib.blake2b(_MODULE_STAMP, digest_size=16)
+    h.update(json.dumps([signature.to_dict(), prices], sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def _load_report_cache(output_dir: Path) -> Dict[str, str]:
+    """signature_id -> digest of the report currently on disk"""
+    try:
+        with open(output_dir / _REPORT_CACHE_FILE, 'rb') as f:
+            cache = json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _render_report(job) -> Path:
+    """Render and write one report (runs in the worker processes)"""
+    signature, current_prices, filepath, summary, agg = job
+    _write_text(filepath, generate_signature_report_html(signature, current_prices, summary, agg))
+    return filepath
 
 
 def save_report(signature, current_prices: Dict[str, float], 
-                output_dir: Optional[Path] = None) -> Path:
+                output_dir: Optional[Path] = None,
+                summary: Optional[dict] = None) -> Path:
     """
     Save HTML report for a signature.
     
+    Pass summary to reuse an already computed signature.get_summary().
     Returns path to saved file.
     """
+    summaries = {signature.signature_id: summary} if summary is not None else None
+    return save_reports([signature], current_prices, output_dir, workers=1,
+                        summaries=summaries)[0]
+
+
+def save_reports(signatures: List, current_prices: Dict[str, float],
+                 output_dir: Optional[Path] = None, workers: Optional[int] = None,
+                 summaries: Optional[Dict[str, dict]] = None,
+                 aggregates: Optional[Dict[str, _Aggregates]] = None) -> List[Path]:
+    """
+    Save HTML reports for many signatures.
+    
+    Reports whose inputs (the signature and the current prices of its open
+    tickers) are unchanged since they were last written are not rewritten
+    at all, so their "Generated" time is when those prices were rendered
+    (index.html shows the time of the current run). The digests are kept
+    in <output_dir>/.cache.json. Live prices are part of the inputs, so
+    while the market is open most reports with open positions change on
+    every run; the skip mainly helps closed signatures and runs outside
+    market hours.
+    
+    Args:
+        signatures: Signature objects (pickled to the workers)
+        current_prices: Dict of ticker -> current price
+        output_dir: Report directory (default data/reports)
+        workers: Worker processes. By default reports are written serially,
+            or with one process per CPU for _POOL_MIN_JOBS or more reports;
+            1 always writes serially
+        summaries: Optional signature_id -> get_summary() results
+        aggregates: Optional signature_id -> _compute_aggregates() results
+    
+    Returns list of report paths, in the order of signatures.
+    """
     if output_dir is None:
         output_dir = DATA_DIR / 'reports'
     
     output_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_css(output_dir)
     
-    html = generate_signature_report_html(signature, current_prices)
+    summaries = summaries or {}
+    aggregates = aggregates or {}
+    cache = _load_report_cache(output_dir)
     
-    filepath = output_dir / f"report_{signature.signature_id}.html"
-    with open(filepath, 'w') as f:
-        f.write(html)
+    paths = []
+    jobs = []
+    digests = {}
+    for sig in signatures:
+        filepath = output_dir / f"report_{sig.signature_id}.html"
+        paths.append(filepath)
+        
+        digest = _report_digest(sig, current_prices)
+        if cache.get(sig.signature_id) == digest and filepath.exists():
+            continue
+        digests[sig.signature_id] = digest
+        jobs.append((sig, current_prices, filepath, summaries.get(sig.signature_id),
+                     aggregates.get(sig.signature_id)))
     
-    return filepath
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(jobs) >= _POOL_MIN_JOBS else 1
+    workers = min(workers, len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            _render_report(job)
+    else:
+        # Chunking lets each pickled batch share one copy of current_prices
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(_render_report, jobs, chunksize=chunksize))
+    
+    # The cache is only touched here in the parent, after all writes finished
+    if digests:
+        cache.update(digests)
+        _write_text(output_dir / _REPORT_CACHE_FILE, json.dumps(cache, indent=2, sort_keys=True))
+    
+    return paths
 
 
 def save_signatures_index(signatures: List, current_prices: Dict[str, float],
-                          output_dir: Optional[Path] = None) -> Path:
+                          output_dir: Optional[Path] = None,
+                          summaries: Optional[Dict[str, dict]] = None,
+                          aggregates: Optional[Dict[str, _Aggregates]] = None) -> Path:
     """
     Save HTML index of all signatures.
+    
+    summaries (signature_id -> get_summary()) is computed here when not
+    given; callers that also write the per-signature reports should build
+    it (and aggregates) once and pass it to both, as save_reports_batch()
+    does.
     """
     if output_dir is None:
         output_dir = DATA_DIR / 'reports'
     
     output_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_css(output_dir)
+    
+    if summaries is None:
+        summaries = {sig.signature_id: sig.get_summary() for sig in signatures}
     
-    html = generate_signatures_list_html(signatures, current_prices)
+    html = generate_signatures_list_html(signatures, current_prices, summaries, aggregates)
     
     filepath = output_dir / "index.html"
-    with open(filepath, 'w') as f:
-        f.write(html)
+    _write_text(filepath, html)
     
     return filepath
+
+
+def save_reports_batch(signatures: List, current_prices: Dict[str, float],
+                       output_dir: Optional[Path] = None,
+                       workers: Optional[int] = None) -> Path:
+    """
+    Save the reports for all signatures, then the index.
+    
+    Summaries and P/L aggregates are computed once per signature and shared
+    by the reports and the index. Returns the index path.
+    """
+    summaries = {sig.signature_id: sig.get_summary() for sig in signatures}
+    aggregates = {sig.signature_id: _compute_aggregates(sig, current_prices)
+                  for sig in signatures}
+    
+    save_reports(signatures, current_prices, output_dir, workers, summaries, aggregates)
+    return save_signatures_index(signatures, current_prices, output_dir, summaries, aggregates)
@@ -0,0 +1,63 @@
+"""
+P/L Math
+========
+Vectorized profit/loss helpers shared by the CLI commands.
+
+P/L percent is always (current - entry) / entry * 100. A position whose
+entry or current price is missing (NaN) or non-positive counts as 0%
+instead of raising, so one bad quote can't break a whole listing.
+"""
+
+import numpy as np
+
+
+def pnl_percent(entries, currents) -> np.ndarray:
+    """Percent P/L for each (entry, current) pair"""
+    entries = np.asarray(entries, dtype=np.float64)
+    currents = np.asarray(currents, dtype=np.float64)
+    
+    pnls = np.zeros_like(entries)
+    valid = (entries > 0) & (currents > 0)  # NaN compares False
+    np.divide(currents - entries, entries, out=pnls, where=valid)
+    return pnls * 100.0
+
+
+def group_sum(values, group_ids, n_groups: int) -> np.ndarray:
+    """
+    Sum values per group.
+    
+    group_ids[i] is the group (0..n_groups-1) that values[i] belongs to.
+    Groups with no values sum to 0.
+    """
+    return np.bincount(np.asarray(group_ids, dtype=np.intp),
+                       weights=np.asarray(values, dtype=np.float64),
+                       minlength=n_groups)
+
+
+def live_aggregate(entries, group_ids, currents):
+    """
+    Aggregate open positions per ticker for live P/L.
+    
+    Args:
+        entries: Entry price of each open position
+        group_ids: Index into `currents` of each position's ticker
+        currents: Current quote per ticker (NaN or 0 when unavailable)
+    
+    Returns:
+        Tuple of (avg_entries, counts, pnls, avg_pnl, total_positions).
+        The per-ticker arrays line up with `currents`. Tickers without a
+        quote are left out of avg_pnl and total_positions.
+    """
+    currents = np.asarray(currents, dtype=np.float64)
+    n = len(currents)
+    
+    counts = np.bincount(np.asarray(group_ids, dtype=np.intp), minlength=n)
+    avg_entries = group_sum(entries, group_ids, n) / np.maximum(counts, 1)
+    pnls = pnl_percent(avg_entries, currents)
+    
+    # Position-weighted average across quoted tickers
+    quoted = currents > 0
+    total_positions = int(counts[quoted].sum())
+    avg_pnl = float((pnls * counts)[quoted].sum() / total_positions) if total_positions else 0.0
+    
+    return avg_entries, counts, pnls, avg_pnl, total_positions
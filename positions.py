@@ -7,14 +7,21 @@ Provides cost basis for P&L calculations.
 """
 
 import csv
+import sys
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from config import POSITIONS_FILE
 
+# Columns used from the Fidelity export
+_COLUMNS = ('Symbol', 'Value', 'CostBasis', 'NumAccounts')
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Position:
     """A portfolio position with cost basis"""
     symbol: str
@@ -42,13 +49,39 @@ class Position:
         return self.cost_basis
 
 
+def _compute_pnls(values: np.ndarray, cost_basis: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    P&L in dollars and percent for aligned value/cost-basis arrays.
+    
+    Percent is 0 where there is no cost basis. Works in place on the
+    result buffers so only two arrays are allocated.
+    """
+    pnl_dollar = np.subtract(values, cost_basis)
+    pnl_pct = np.zeros_like(pnl_dollar)
+    np.divide(pnl_dollar, cost_basis, out=pnl_pct, where=cost_basis > 0)
+    pnl_pct *= 100.0
+    return pnl_dollar, pnl_pct
+
+
 class PositionsManager:
-    """Load and query portfolio positions"""
+    """
+    Load and query portfolio positions.
+    
+    The file is read once, when the manager is created; call load() again
+    to pick up changes. Positions are stored column-wise (one NumPy array
+    per field, in file order) with a symbol -> row index; Position objects
+    are only built when a caller asks for one.
+    """
     
     def __init__(self, positions_file: Optional[Path] = None):
         self.positions_file = positions_file or POSITIONS_FILE
-        self._positions: Dict[str, Position] = {}
-        self._loaded = False
+        self._symbols = np.empty(0, dtype=object)
+        self._values = np.empty(0, dtype=np.float64)
+        self._cost_basis = np.empty(0, dtype=np.float64)
+        self._num_accounts = np.empty(0, dtype=np.int32)
+        self._index: Dict[str, int] = {}
+        self._positions_view: Optional[Mapping[str, Position]] = None
+        self.load()
     
     def load(self) -> bool:
         """Load positions from CSV file"""
@@ -57,50 +90,140 @@ class PositionsManager:
             return False
         
         try:
-            with open(self.positions_file, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    symbol = row.get('Symbol', '').strip()
-                    if not symbol:
-                        continue
-                    
-                    try:
-                        value = float(row.get('Value', 0))
-                        cost_basis = float(row.get('CostBasis', 0))
-                        num_accounts = int(row.get('NumAccounts', 1))
-                    except (ValueError, TypeError):
-                        continue
-                    
-                    self._positions[symbol] = Position(
-                        symbol=symbol,
-                        value=value,
-                        cost_basis=cost_basis,
-                        num_accounts=num_accounts
-                    )
+            try:
+                import pandas as pd
+            except ImportError:
+                pd = None
             
-            self._loaded = True
+            if pd is not None:
+                columns = self._read_pandas(pd)
+            else:
+                columns = self._read_csv()
+            self._set_columns(*columns)
             return True
             
         except Exception as e:
             print(f"❌ Error loading positions: {e}")
             return False
     
+    def _read_pandas(self, pd) -> Tuple[list, list, list, list]:
+        """Parse the export with pandas' C reader"""
+        empty = ([], [], [], [])
+        
+        # Read everything as text (no NA guessing, so a symbol like "NA"
+        # survives) and convert the numeric columns in one pass each
+        try:
+            df = pd.read_csv(self.positions_file, encoding='utf-8-sig', dtype=str,
+                             keep_default_na=False, usecols=lambda c: c in _COLUMNS)
+        except pd.errors.EmptyDataError:
+            return empty
+        if 'Symbol' not in df:
+            return empty
+        
+        def numeric(column, default):
+            if column not in df:
+                return default
+            return pd.to_numeric(df[column].str.strip(), errors='coerce')
+        
+        frame = pd.DataFrame({
+            'Symbol': df['Symbol'].str.strip(),
+            'Value': numeric('Value', 0.0),
+            'CostBasis': numeric('CostBasis', 0.0),
+            'NumAccounts': numeric('NumAccounts', 1),
+        })
+        # Rows without a symbol or with unparseable numbers are skipped
+        frame = frame[frame['Symbol'] != ''].dropna()
+        num_accounts = frame['NumAccounts'].to_numpy(dtype=np.float64)
+        frame = frame[np.isfinite(num_accounts) & (num_accounts == np.floor(num_accounts))]
+        
+        return (frame['Symbol'].tolist(), frame['Value'].to_numpy(dtype=np.float64),
+                frame['CostBasis'].to_numpy(dtype=np.float64),
+                frame['NumAccounts'].to_numpy(dtype=np.float64))
+    
+    def _read_csv(self) -> Tuple[list, list, list, list]:
+        """Parse the export row by row (used when pandas is unavailable)"""
+        symbols, values, cost_bases, num_accounts_list = [], [], [], []
+        
+        with open(self.positions_file, 'r', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                symbol = row.get('Symbol', '').strip()
+                if not symbol:
+                    continue
+                
+                try:
+                    value = float(row.get('Value', 0))
+                    cost_basis = float(row.get('CostBasis', 0))
+                    num_accounts = int(row.get('NumAccounts', 1))
+                except (ValueError, TypeError):
+                    continue
+                
+                symbols.append(symbol)
+                values.append(value)
+                cost_bases.append(cost_basis)
+                num_accounts_list.append(num_accounts)
+        
+        return symbols, values, cost_bases, num_accounts_list
+    
+    def _set_columns(self, symbols, values, cost_basis, num_accounts):
+        """Store parsed rows; a symbol listed twice keeps its last row"""
+        # Symbols are interned so the index keys, the symbol column and the
+        # Position objects built from it share one string per ticker, and
+        # lookups with other interned tickers hit the identity fast path
+        last_row = {}
+        for i, symbol in enumerate(symbols):
+            last_row[sys.intern(symbol)] = i
+        keep = np.fromiter(last_row.values(), dtype=np.intp, count=len(last_row))
+        
+        self._symbols = np.array(list(last_row), dtype=object)
+        self._values = np.asarray(values, dtype=np.float64)[keep]
+        self._cost_basis = np.asarray(cost_basis, dtype=np.float64)[keep]
+        self._num_accounts = np.asarray(num_accounts, dtype=np.int32)[keep]
+        self._index = {symbol: i for i, symbol in enumerate(last_row)}
+        self._positions_view = None
+    
+    def _position(self, idx: int) -> Position:
+        """Materialize row idx as a Position"""
+        return Position(
+            symbol=self._symbols[idx],
+            value=float(self._values[idx]),
+            cost_basis=float(self._cost_basis[idx]),
+            num_accounts=int(self._num_accounts[idx])
+        )
+    
     def get(self, symbol: str) -> Optional[Position]:
         """Get position for a symbol"""
-        if not self._loaded:
-            self.load()
-        return self._positions.get(symbol)
+        idx = self._index.get(symbol)
+        return self._position(idx) if idx is not None else None
     
     def get_cost_basis(self, symbol: str) -> Optional[float]:
         """Get cost basis for a symbol"""
-        pos = self.get(symbol)
-        return pos.cost_basis if pos else None
+        idx = self._index.get(symbol)
+        return float(self._cost_basis[idx]) if idx is not None else None
     
-    def get_all(self) -> Dict[str, Position]:
-        """Get all positions"""
-        if not self._loaded:
-            self.load()
-        return self._positions.copy()
+    def get_all(self, copy: bool = False) -> Mapping[str, Position]:
+        """
+        Get all positions.
+        
+        Returns a read-only view that is built once per load; pass
+        copy=True for a dict the caller may modify.
+        """
+        if self._positions_view is None:
+            self._positions_view = MappingProxyType(
+                {symbol: self._position(idx) for symbol, idx in self._index.items()})
+        return dict(self._positions_view) if copy else self._positions_view
+    
+    def total_pnl_dollar(self) -> float:
+        """Total P&L in dollars across all positions"""
+        return float(_compute_pnls(self._values, self._cost_basis)[0].sum())
+    
+    def pnl_percent_array(self) -> np.ndarray:
+        """
+        P&L percent of every position, in get_all() order.
+        
+        Same rule as Position.pnl_percent: 0 when there is no cost basis.
+        """
+        return _compute_pnls(self._values, self._cost_basis)[1]
     
     def calculate_pnl(self, symbol: str, current_price: float, quantity: float = None) -> dict:
         """
@@ -130,19 +253,13 @@ class PositionsManager:
         }
     
     def __len__(self):
-        if not self._loaded:
-            self.load()
-        return len(self._positions)
+        return len(self._index)
     
     def __contains__(self, symbol: str):
-        if not self._loaded:
-            self.load()
-        return symbol in self._positions
+        return symbol in self._index
 
 
 # Convenience function
 def load_positions(positions_file: Optional[Path] = None) -> Dict[str, Position]:
     """Load positions and return as dict"""
-    mgr = PositionsManager(positions_file)
-    mgr.load()
-    return mgr.get_all()
+    return PositionsManager(positions_file).get_all(copy=True)
@@ -12,29 +12,112 @@ Entry price rules:
 For closing positions (sells), always use current/latest price.
 """
 
+import warnings
+
 import yfinance as yf
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from config import get_market_status
+from config import get_market_status, QUOTE_TTL_OPEN, QUOTE_TTL_CLOSED
+from prices_cache import PriceCache
+
+# yfinance's own session factory (curl_cffi when available); older
+# releases without it fall back to yfinance's internal session
+try:
+    from yfinance.data import new_session as new_yf_session
+except ImportError:
+    new_yf_session = None
+
+# yfinance's cookie/crumb-aware client, used for Yahoo's multi-symbol quote
+# endpoint; without it intraday quotes come from yf.download only
+try:
+    from yfinance.data import YfData
+except ImportError:
+    YfData = None
+
+_QUOTE_URL = 'https://query1.finance.yahoo.com/v7/finance/quote'
+
+# Max concurrent HTTP requests when falling back to per-ticker fetches
+MAX_FETCH_WORKERS = 32
+
+# Max concurrent quote requests in get_intraday_quotes (Yahoo rate-limits
+# the quote endpoint harder than price history)
+MAX_QUOTE_WORKERS = 8
+
+# Tickers per yf.download request for current prices
+BATCH_SIZE = 100
+
+# Symbols per request to the quote endpoint in get_intraday_quotes
+QUOTE_BATCH_SIZE = 20
 
 
 class PriceFetcher:
     """Fetches stock prices with market-aware timing"""
     
-    def __init__(self):
-        self._cache = {}  # Simple cache for current session
+    def __init__(self, session=None):
+        # Entry prices fetched this session, keyed by
+        # (ticker, price_type, reference_date)
+        self._cache = {}
+        self._price_cache = PriceCache()  # Persistent across invocations
+        
+        # One HTTP session for every Yahoo request this fetcher makes, so
+        # connections (and Yahoo's cookie/crumb) are reused across calls
+        if session is None and new_yf_session is not None:
+            session = new_yf_session()
+        self.session = session
+    
+    def close(self):
+        """Close the HTTP session"""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+    
+    def __enter__(self) -> 'PriceFetcher':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
     
     def get_entry_prices(self, tickers: List[str]) -> Dict[str, dict]:
         """
         Get entry prices for tickers based on current market status.
         
+        Prices already fetched in this session for the same price type and
+        day are reused; only the rest are downloaded.
+        
         Returns dict of ticker -> {price, price_type, date, time}
         """
         if not tickers:
             return {}
         
         market = get_market_status()
+        key_tail = (market['price_type'], market['reference_date'])
+        
+        # Entries from an earlier market phase or day no longer apply
+        stale = [k for k in self._cache if k[1:] != key_tail]
+        for k in stale:
+            del self._cache[k]
+        
+        results = {}
+        misses = []
+        for ticker in tickers:
+            cached = self._cache.get((ticker,) + key_tail)
+            if cached is not None:
+                results[ticker] = dict(cached)
+            else:
+                misses.append(ticker)
+        
+        if misses:
+            fetched = self._download_entry_prices(misses, market)
+            for ticker, entry in fetched.items():
+                self._cache[(ticker,) + key_tail] = entry
+                results[ticker] = dict(entry)
+        
+        return results
+    
+    def _download_entry_prices(self, tickers: List[str], market: dict) -> Dict[str, dict]:
+        """Entry prices for tickers from one yf.download call"""
         results = {}
         
         # Fetch historical data to get open/close prices
@@ -44,48 +127,35 @@ class PriceFetcher:
                 tickers, 
                 period='5d',
                 progress=False,
+                session=self.session,
                 group_by='ticker' if len(tickers) > 1 else None
             )
             
             if data.empty:
                 return results
             
-            for ticker in tickers:
-                try:
-                    if len(tickers) == 1:
-                        ticker_data = data
-                    else:
-                        ticker_data = data[ticker]
-                    
-                    if ticker_data.empty:
-                        continue
-                    
-                    # Get the appropriate price based on market status
-                    if market['price_type'] == 'open':
-                        # Intraday: use today's open
-                        price = float(ticker_data['Open'].iloc[-1])
-                        price_date = ticker_data.index[-1]
-                    elif market['price_type'] == 'close':
-                        # After hours: use today's close
-                        price = float(ticker_data['Close'].iloc[-1])
-                        price_date = ticker_data.index[-1]
-                    else:
-                        # Pre-market or weekend: use previous close
-                        price = float(ticker_data['Close'].iloc[-1])
-                        price_date = ticker_data.index[-1]
-                    
-                    results[ticker] = {
-                        'price': price,
-                        'price_type': market['price_type'],
-                        'date': price_date.strftime('%Y-%m-%d') if hasattr(price_date, 'strftime') else str(price_date)[:10],
-                        'fetched_at': datetime.now().isoformat(),
-                        'market_status': market['description']
-                    }
-                    
-                except Exception as e:
-                    print(f"Warning: Could not get price for {ticker}: {e}")
-                    continue
-                    
+            # Intraday: use today's open. After hours: today's close.
+            # Pre-market or weekend: previous close (the last row either way)
+            field = 'Open' if market['price_type'] == 'open' else 'Close'
+            latest = _latest_field(data, field, tickers)
+            
+            price_date = data.index[-1]
+            date = price_date.strftime('%Y-%m-%d') if hasattr(price_date, 'strftime') else str(price_date)[:10]
+            fetched_at = datetime.now().isoformat()
+            wanted = set(tickers)
+            
+            results = {
+                ticker: {
+                    'price': float(price),
+                    'price_type': market['price_type'],
+                    'date': date,
+                    'fetched_at': fetched_at,
+                    'market_status': market['description']
+                }
+                for ticker, price in latest.items()
+                if ticker in wanted and not pd.isna(price)
+            }
+        
         except Exception as e:
             print(f"Warning: Price fetch error: {e}")
         
@@ -95,83 +165,287 @@ class PriceFetcher:
         """
         Get current/latest prices for tickers.
         Used for closing positions and P/L calculations.
+        
+        Prices fetched recently (see QUOTE_TTL_*) are served from the
+        on-disk cache; only the misses go to the network.
         """
         if not tickers:
             return {}
         
+        ttl = QUOTE_TTL_OPEN if get_market_status()['is_open'] else QUOTE_TTL_CLOSED
+        prices = self._price_cache.get_many(tickers, ttl)
+        
+        misses = [t for t in tickers if t not in prices]
+        if misses:
+            fetched = self._fetch_current_prices(misses)
+            self._price_cache.put_many(fetched)
+            prices.update(fetched)
+        
+        return prices
+    
+    def _fetch_current_prices(self, tickers: List[str]) -> Dict[str, float]:
+        """Fetch latest prices from Yahoo, batched where possible"""
         prices = {}
         
         try:
             if len(tickers) == 1:
-                stock = yf.Ticker(tickers[0])
+                stock = yf.Ticker(tickers[0], session=self.session)
                 hist = stock.history(period='1d')
                 if not hist.empty:
                     prices[tickers[0]] = float(hist['Close'].iloc[-1])
             else:
-                data = yf.download(tickers, period='1d', progress=False)
-                if not data.empty:
-                    for ticker in tickers:
-                        try:
-                            if ticker in data['Close'].columns:
-                                price = data['Close'][ticker].iloc[-1]
-                                if not pd.isna(price):
-                                    prices[ticker] = float(price)
-                            elif len(tickers) == 1:
-                                prices[ticker] = float(data['Close'].iloc[-1])
-                        except:
-                            pass
+                # One download per batch of symbols rather than per symbol
+                for i in range(0, len(tickers), BATCH_SIZE):
+                    prices.update(self._batch_closes(tickers[i:i + BATCH_SIZE]))
         except Exception as e:
             print(f"Warning: Current price fetch error: {e}")
-            # Fall back to individual fetches
-            for ticker in tickers:
-                try:
-                    stock = yf.Ticker(ticker)
-                    hist = stock.history(period='1d')
-                    if not hist.empty:
-                        prices[ticker] = float(hist['Close'].iloc[-1])
-                except:
-                    pass
+            # Fall back to individual fetches, issued concurrently
+            missing = [t for t in tickers if t not in prices]
+            prices.update(self._fetch_closes_concurrent(missing))
+        
+        return prices
+    
+    def _batch_closes(self, chunk: List[str]) -> Dict[str, float]:
+        """Latest close for a batch of tickers from a single yf.download call"""
+        prices = {}
+        
+        data = yf.download(chunk, period='1d', progress=False, session=self.session)
+        if data.empty:
+            return prices
+        
+        closes = data['Close']
+        for ticker in chunk:
+            try:
+                if ticker in closes.columns:
+                    price = closes[ticker].iloc[-1]
+                    if not pd.isna(price):
+                        prices[ticker] = float(price)
+                elif len(chunk) == 1:
+                    prices[ticker] = float(closes.iloc[-1])
+            except:
+                pass
+        
+        return prices
+    
+    def _fetch_closes_concurrent(self, tickers: List[str]) -> Dict[str, float]:
+        """
+        Fetch latest close for each ticker with one request per ticker,
+        running the requests in parallel. Wall time is roughly the slowest
+        single request instead of the sum of all of them.
+        """
+        if not tickers:
+            return {}
+        
+        def fetch(ticker: str) -> Optional[float]:
+            try:
+                hist = yf.Ticker(ticker, session=self.session).history(period='1d')
+                if not hist.empty:
+                    return float(hist['Close'].iloc[-1])
+            except Exception:
+                pass
+            return None
+        
+        prices = {}
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(tickers))) as ex:
+            for ticker, price in zip(tickers, ex.map(fetch, tickers)):
+                if price is not None:
+                    prices[ticker] = price
         
         return prices
     
     def get_intraday_quotes(self, tickers: List[str]) -> Dict[str, dict]:
         """
         Get real-time intraday quotes with bid/ask if available.
+        
+        Quotes come from Yahoo's quote endpoint, QUOTE_BATCH_SIZE symbols
+        per request with the requests in flight concurrently. Tickers it
+        doesn't return fall back to one yf.download of recent daily bars per
+        batch (today's bar is live during market hours), and any still
+        missing are looked up one by one, concurrently.
         """
         if not tickers:
             return {}
         
-        quotes = {}
+        batched = {}
+        if YfData is not None:
+            try:
+                batched.update(self._endpoint_quotes(tickers))
+            except (AttributeError, TypeError) as e:
+                # YfData is internal to yfinance; if a release changed it,
+                # fall back to the yf.download path below
+                warnings.warn(f"yfinance quote client unusable, using yf.download: {e}")
         
-        for ticker in tickers:
+        misses = [t for t in tickers if t not in batched]
+        for i in range(0, len(misses), BATCH_SIZE):
+            chunk = misses[i:i + BATCH_SIZE]
             try:
-                stock = yf.Ticker(ticker)
-                info = stock.info
-                
-                quotes[ticker] = {
-                    'price': info.get('regularMarketPrice') or info.get('currentPrice'),
-                    'open': info.get('regularMarketOpen'),
-                    'high': info.get('regularMarketDayHigh'),
-                    'low': info.get('regularMarketDayLow'),
-                    'previous_close': info.get('regularMarketPreviousClose'),
-                    'change_pct': info.get('regularMarketChangePercent'),
-                    'volume': info.get('regularMarketVolume'),
-                }
+                batched.update(self._batch_quotes(chunk))
             except Exception as e:
-                # Fall back to history
+                warnings.warn(f"Batch quote fetch failed for {len(chunk)} tickers: {e}")
+        
+        misses = [t for t in misses if t not in batched]
+        if misses:
+            with ThreadPoolExecutor(max_workers=min(MAX_QUOTE_WORKERS, len(misses))) as ex:
+                for ticker, quote in zip(misses, ex.map(self._fetch_quote, misses)):
+                    if quote is not None:
+                        batched[ticker] = quote
+        
+        return {t: batched[t] for t in tickers if t in batched}
+    
+    def _endpoint_quotes(self, tickers: List[str]) -> Dict[str, dict]:
+        """Quotes from the multi-symbol quote endpoint, chunks fetched concurrently"""
+        client = YfData(session=self.session)
+        chunks = [tickers[i:i + QUOTE_BATCH_SIZE]
+                  for i in range(0, len(tickers), QUOTE_BATCH_SIZE)]
+        quotes = {}
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_QUOTE_WORKERS, len(chunks))) as ex:
+            futures = [ex.submit(self._quote_chunk, client, chunk) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
                 try:
-                    hist = stock.history(period='1d')
-                    if not hist.empty:
-                        quotes[ticker] = {
-                            'price': float(hist['Close'].iloc[-1]),
-                            'open': float(hist['Open'].iloc[-1]),
-                            'high': float(hist['High'].iloc[-1]),
-                            'low': float(hist['Low'].iloc[-1]),
-                        }
-                except:
-                    pass
+                    quotes.update(future.result())
+                except (AttributeError, TypeError):
+                    raise  # the client API itself changed; see get_intraday_quotes
+                except Exception as e:
+                    warnings.warn(f"Quote request failed for {len(chunk)} tickers: {e}")
+        
+        return quotes
+    
+    @staticmethod
+    def _quote_chunk(client, chunk: List[str]) -> Dict[str, dict]:
+        """Quotes for one chunk of tickers from a single quote endpoint request"""
+        data = client.get_raw_json(_QUOTE_URL, params={
+            'symbols': ','.join(chunk),
+            'formatted': 'false',
+        })
+        quotes = {}
+        
+        for q in (data.get('quoteResponse') or {}).get('result') or []:
+            price = q.get('regularMarketPrice')
+            if price is None:
+                continue
+            quotes[q['symbol']] = {
+                'price': price,
+                'open': q.get('regularMarketOpen'),
+                'high': q.get('regularMarketDayHigh'),
+                'low': q.get('regularMarketDayLow'),
+                'previous_close': q.get('regularMarketPreviousClose'),
+                'change_pct': q.get('regularMarketChangePercent'),
+                'volume': q.get('regularMarketVolume'),
+                'bid': q.get('bid'),
+                'ask': q.get('ask'),
+            }
+        
+        return quotes
+    
+    def _batch_quotes(self, chunk: List[str]) -> Dict[str, dict]:
+        """Quotes for a batch of tickers from a single yf.download call"""
+        quotes = {}
+        
+        data = yf.download(chunk, period='5d', progress=False, group_by='ticker',
+                           session=self.session)
+        if data is None or data.empty:
+            return quotes
+        
+        for ticker in chunk:
+            frame = _ticker_frame(data, ticker, len(chunk))
+            if frame is None or 'Close' not in frame:
+                continue
+            bars = frame.dropna(subset=['Close'])
+            if bars.empty:
+                continue
+            
+            last = bars.iloc[-1]
+            price = float(last['Close'])
+            previous_close = float(bars['Close'].iloc[-2]) if len(bars) > 1 else None
+            volume = last.get('Volume')
+            
+            quotes[ticker] = {
+                'price': price,
+                'open': _float_or_none(last.get('Open')),
+                'high': _float_or_none(last.get('High')),
+                'low': _float_or_none(last.get('Low')),
+                'previous_close': previous_close,
+                'change_pct': (price / previous_close - 1) * 100 if previous_close else None,
+                'volume': int(volume) if volume is not None and not pd.isna(volume) else None,
+            }
         
         return quotes
+    
+    def _fetch_quote(self, ticker: str) -> Optional[dict]:
+        """Intraday quote for one ticker, falling back to today's bar"""
+        stock = yf.Ticker(ticker, session=self.session)
+        try:
+            info = stock.info
+            return {
+                'price': info.get('regularMarketPrice') or info.get('currentPrice'),
+                'open': info.get('regularMarketOpen'),
+                'high': info.get('regularMarketDayHigh'),
+                'low': info.get('regularMarketDayLow'),
+                'previous_close': info.get('regularMarketPreviousClose'),
+                'change_pct': info.get('regularMarketChangePercent'),
+                'volume': info.get('regularMarketVolume'),
+            }
+        except Exception as e:
+            info_error = e
+        
+        # Fall back to history
+        try:
+            hist = stock.history(period='1d')
+            if not hist.empty:
+                return {
+                    'price': float(hist['Close'].iloc[-1]),
+                    'open': float(hist['Open'].iloc[-1]),
+                    'high': float(hist['High'].iloc[-1]),
+                    'low': float(hist['Low'].iloc[-1]),
+                }
+        except Exception as e:
+            warnings.warn(f"No quote for {ticker}: {info_error}; history fallback: {e}")
+            return None
+        
+        warnings.warn(f"No quote for {ticker}: {info_error}; no history for today")
+        return None
+
+
+def _ticker_frame(data: pd.DataFrame, ticker: str, n_tickers: int) -> Optional[pd.DataFrame]:
+    """
+    One ticker's columns from a yf.download result.
+    
+    Handles both column layouts (ticker, field) and (field, ticker), and
+    the flat columns some versions return for a single ticker.
+    """
+    columns = data.columns
+    if isinstance(columns, pd.MultiIndex):
+        if ticker in columns.get_level_values(0):
+            return data[ticker]
+        if ticker in columns.get_level_values(1):
+            return data.xs(ticker, axis=1, level=1)
+        return None
+    return data if n_tickers == 1 else None
+
+
+def _latest_field(data: pd.DataFrame, field: str, tickers: List[str]) -> pd.Series:
+    """
+    Last-row values of one price field for every ticker in a yf.download
+    result, as a Series indexed by ticker.
+    
+    Reads the last row once instead of resolving each ticker's columns;
+    handles the same column layouts as _ticker_frame.
+    """
+    last = data.iloc[-1]
+    columns = data.columns
+    if isinstance(columns, pd.MultiIndex):
+        for level in (1, 0):
+            if field in columns.get_level_values(level):
+                return last.xs(field, level=level)
+        return pd.Series(dtype=float)
+    if len(tickers) == 1 and field in columns:
+        return pd.Series({tickers[0]: last[field]})
+    return pd.Series(dtype=float)
+
+
+def _float_or_none(value) -> Optional[float]:
+    return None if value is None or pd.isna(value) else float(value)
 
 
 # Module-level instance for convenience
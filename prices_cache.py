@@ -0,0 +1,81 @@
+"""
+Price Cache
+===========
+Persistent quote cache shared across CLI invocations.
+
+Current prices are stored in a small SQLite table keyed by ticker with the
+time they were fetched. A cached price is reused while it is younger than
+the TTL passed in by the caller, so running `signatures`, `report`, `html`
+back to back only hits the network once per TTL window.
+
+TTL ladder (see config.py):
+- Market open: 30 seconds
+- Market closed: 1 hour
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import PRICES_CACHE_FILE
+
+
+class PriceCache:
+    """SQLite-backed ticker -> (price, fetched_at) cache"""
+    
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = cache_file or PRICES_CACHE_FILE
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self._conn is None:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.cache_file))
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS prices ("
+                "ticker TEXT PRIMARY KEY, price REAL NOT NULL, ts REAL NOT NULL)"
+            )
+        return self._conn
+    
+    def get_many(self, tickers: List[str], ttl: float) -> Dict[str, float]:
+        """Return cached prices for tickers fetched within the last `ttl` seconds"""
+        if not tickers:
+            return {}
+        
+        cutoff = time.time() - ttl
+        hits = {}
+        
+        try:
+            conn = self._connect()
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT ticker, price FROM prices "
+                    f"WHERE ts > ? AND ticker IN ({placeholders})",
+                    [cutoff, *chunk]
+                )
+                hits.update(rows)
+        except sqlite3.Error as e:
+            print(f"Warning: Price cache read error: {e}")
+        
+        return hits
+    
+    def put_many(self, prices: Dict[str, float]):
+        """Store freshly fetched prices"""
+        if not prices:
+            return
+        
+        now = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO prices (ticker, price, ts) VALUES (?, ?, ?)",
+                    [(t, p, now) for t, p in prices.items()]
+                )
+        except sqlite3.Error as e:
+            print(f"Warning: Price cache write error: {e}")
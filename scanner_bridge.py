@@ -7,12 +7,87 @@ We don't use the scanner for buy signals - those come from the HTML files.
 The scanner is only used to check if any open positions have moved to Sell zone.
 """
 
+import ast
+import importlib.util
+import json
+import os
 import subprocess
 import sys
 import re
+import time
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Set
-from config import SCANNER_DIR
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+from config import (PROJECT_ROOT, SCANNER_DIR, SCANNER_IN_PROCESS,
+                    SELL_CACHE_FILE, SELL_CACHE_TTL)
+
+# Name the scanner's main.py is imported under (avoids clashing with any
+# other module called "main")
+_SCANNER_MODULE = 'psar_scanner_main'
+
+# Interpreter command for scanner subprocesses. UTF-8 mode keeps the emoji
+# section markers intact whatever the locale (-S/-I would drop the
+# scanner's site-packages and script directory, so they are not used)
+_PYTHON = (sys.executable, '-X', 'utf8')
+
+# Longest comma-joined ticker list passed as --tickers; longer lists go
+# through --tickers-file
+_ARGV_TICKERS_MAX = 32 * 1024
+
+# Zones check_single_ticker() can report
+_ZONES = frozenset({'strong_buy', 'buy', 'early_buy', 'hold', 'sell'})
+
+
+# Candidate ticker words in scanner output
+_WORD_RE = re.compile(r'\b([A-Z]{1,5})\b')
+
+# Explicit sell markers (matched case-insensitively, like the tickers)
+_SELL_MARKER_RE = re.compile('SELL|🔴', re.IGNORECASE)
+
+
+@lru_cache(maxsize=16)
+def _ticker_matcher(tickers: FrozenSet[str]) -> Tuple['re.Pattern', Dict[str, List[str]]]:
+    """
+    One case-insensitive alternation matching any of tickers as a word,
+    plus a map from a match's lowercase text back to the tickers it names.
+    
+    Cached per ticker set: repeated sell checks over the same open
+    positions reuse the compiled pattern.
+    """
+    # Longest first so a ticker wins over its own prefix at the same spot
+    alternation = '|'.join(map(re.escape, sorted(tickers, key=len, reverse=True)))
+    by_lower = {}
+    for ticker in tickers:
+        by_lower.setdefault(ticker.lower(), []).append(ticker)
+    return re.compile(rf'\b(?:{alternation})\b', re.IGNORECASE), by_lower
+
+
+def _zone_key(zone) -> str:
+    """Normalize a scanner zone name ('Strong Buy' -> 'strong_buy')"""
+    return str(zone).strip().lower().replace(' ', '_').replace('-', '_')
+
+
+def _module_names(directory: Path) -> Set[str]:
+    """Top-level module and package names importable from directory"""
+    names = set()
+    for entry in directory.iterdir():
+        if entry.suffix == '.py':
+            names.add(entry.stem)
+        elif entry.is_dir() and (entry / '__init__.py').exists():
+            names.add(entry.name)
+    return names
+
+
+@contextmanager
+def _in_dir(path: Path):
+    """Temporarily chdir (the scanner resolves its data files from cwd)"""
+    prev = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(prev)
 
 
 class ScannerBridge:
@@ -21,6 +96,8 @@ class ScannerBridge:
     def __init__(self):
         self.scanner_dir = SCANNER_DIR
         self._validated = False
+        self._scanner = None  # scanner main module, when usable in-process
+        self._sell_cache: Optional[dict] = None  # recent find_sells results, read on first use
     
     def _validate(self) -> bool:
         """Check if scanner is accessible"""
@@ -34,14 +111,78 @@ class ScannerBridge:
             return False
         
         self._validated = True
+        if SCANNER_IN_PROCESS:
+            self._scanner = self._load_scanner(main_py)
         return True
     
+    def _load_scanner(self, main_py: Path):
+        """
+        Import the scanner's main.py in-process (SCANNER_IN_PROCESS only).
+        
+        Only used if it defines scan_tickers(tickers, quiet=True, email=False)
+        returning {ticker: zone}, checked with ast before anything runs, and
+        if none of its modules share a name with ours (its imports would
+        silently resolve to our modules). Otherwise, or if the import fails,
+        the scanner is run as a subprocess.
+        """
+        try:
+            tree = ast.parse(main_py.read_bytes(), filename=str(main_py))
+        except (OSError, SyntaxError) as e:
+            print(f"⚠️  Could not read scanner main.py, using subprocess: {e}")
+            return None
+        if not any(isinstance(node, ast.FunctionDef) and node.name == 'scan_tickers'
+                   for node in tree.body):
+            print("⚠️  Scanner main.py has no scan_tickers(), using subprocess")
+            return None
+        
+        clashes = _module_names(self.scanner_dir) & _module_names(PROJECT_ROOT)
+        if clashes:
+            print(f"⚠️  Scanner modules clash with ours ({', '.join(sorted(clashes))}), "
+                  f"using subprocess")
+            return None
+        
+        scanner_path = str(self.scanner_dir)
+        added = scanner_path not in sys.path
+        if added:
+            sys.path.insert(0, scanner_path)
+        before = set(sys.modules)
+        
+        try:
+            spec = importlib.util.spec_from_file_location(_SCANNER_MODULE, main_py)
+            module = importlib.util.module_from_spec(spec)
+            with _in_dir(self.scanner_dir):
+                spec.loader.exec_module(module)
+            if not callable(getattr(module, 'scan_tickers', None)):
+                raise ImportError("scan_tickers is not callable")
+        except Exception as e:
+            print(f"⚠️  Scanner import failed, using subprocess: {e}")
+            # Leave no trace of the failed import behind
+            for name in set(sys.modules) - before:
+                del sys.modules[name]
+            if added:
+                sys.path.remove(scanner_path)
+            return None
+        
+        return module
+    
+    def _scan_in_process(self, tickers: List[str]) -> Optional[Dict[str, str]]:
+        """Zones for tickers from the imported scanner, or None on failure"""
+        try:
+            with _in_dir(self.scanner_dir):
+                zones = self._scanner.scan_tickers(tickers, quiet=True, email=False)
+            return {t: _zone_key(z) for t, z in zones.items()}
+        except Exception as e:
+            print(f"\n⚠️  Scanner error, retrying as subprocess: {e}")
+            return None
+    
     def find_sells(self, tickers: List[str]) -> Set[str]:
         """
         Check which tickers are currently in Sell zone.
         
         Calls market-psar-scanner with the specific tickers and
-        parses output to find which are in Sell.
+        parses output to find which are in Sell. A result for the same
+        tickers from the last SELL_CACHE_TTL seconds is reused, unless the
+        scanner's main.py has changed since.
         
         Args:
             tickers: List of tickers to check
@@ -55,23 +196,52 @@ class ScannerBridge:
         if not self._validate():
             return set()
         
-        # Write tickers to temp file
-        temp_file = Path('/tmp/bt_check_sells.txt')
+        key = ','.join(sorted(set(tickers)))
+        cached = self._cached_sells(key)
+        if cached is not None:
+            print(f"   Reusing scanner result for {len(tickers)} tickers (< {SELL_CACHE_TTL}s old)")
+            return cached
+        
+        sells = self._run_scanner(tickers)
+        if sells is None:
+            return set()
+        
+        self._store_sells(key, sells)
+        return sells
+    
+    def _run_scanner(self, tickers: List[str]) -> Optional[Set[str]]:
+        """Sell-zone tickers from a scanner run (None if the scanner failed)"""
+        if self._scanner is not None:
+            print(f"   Running scanner on {len(tickers)} tickers...", end='', flush=True)
+            zones = self._scan_in_process(tickers)
+            if zones is not None:
+                print(" done.")
+                wanted = set(tickers)
+                return {t for t, zone in zones.items() if zone == 'sell' and t in wanted}
+        
+        # Small lists go on the command line; only very long ones need a
+        # tickers file
+        ticker_arg = ','.join(tickers)
+        temp_file = None
         
         try:
-            # Write our tickers
-            with open(temp_file, 'w') as f:
-                f.write('\n'.join(tickers))
+            if len(ticker_arg) <= _ARGV_TICKERS_MAX:
+                source = ['--tickers', ticker_arg]
+            else:
+                temp_file = Path('/tmp/bt_check_sells.txt')
+                temp_file.write_text('\n'.join(tickers), encoding='utf-8')
+                source = ['--tickers-file', str(temp_file)]
             
-            # Run scanner with -mystocks and --tickers-file pointing to our temp file
-            cmd = [sys.executable, 'main.py', '-mystocks', '--tickers-file', str(temp_file), '--no-email', '--quiet']
+            # Run scanner with -mystocks on our tickers
+            cmd = [*_PYTHON, 'main.py', '-mystocks', *source, '--no-email', '--quiet']
             
             print(f"   Running scanner on {len(tickers)} tickers...", end='', flush=True)
             
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
+                encoding='utf-8',
+                errors='replace',
                 cwd=str(self.scanner_dir),
                 timeout=300  # 5 min timeout for large lists
             )
@@ -90,21 +260,58 @@ class ScannerBridge:
             
         except subprocess.TimeoutExpired:
             print("\n⚠️  Scanner timed out (5 min)")
-            return set()
+            return None
         except Exception as e:
             print(f"\n⚠️  Scanner error: {e}")
-            return set()
+            return None
         finally:
             # Clean up temp file
-            temp_file.unlink(missing_ok=True)
+            if temp_file is not None:
+                temp_file.unlink(missing_ok=True)
+    
+    def _scanner_stamp(self) -> int:
+        """Scanner version for the sell cache (main.py modification time)"""
+        return (self.scanner_dir / 'main.py').stat().st_mtime_ns
+    
+    def _cached_sells(self, key: str) -> Optional[Set[str]]:
+        """A find_sells result for the same tickers from the last SELL_CACHE_TTL seconds"""
+        if self._sell_cache is None:
+            try:
+                self._sell_cache = json.loads(SELL_CACHE_FILE.read_bytes())
+            except (OSError, ValueError):
+                self._sell_cache = {}
+        
+        if self._sell_cache.get('scanner_mtime') != self._scanner_stamp():
+            return None
+        entry = self._sell_cache.get('entries', {}).get(key)
+        if entry and time.time() - entry['at'] < SELL_CACHE_TTL:
+            return set(entry['sells'])
+        return None
+    
+    def _store_sells(self, key: str, sells: Set[str]):
+        """Remember a find_sells result, in memory and in SELL_CACHE_FILE"""
+        now = time.time()
+        stamp = self._scanner_stamp()
+        entries = {}
+        if self._sell_cache and self._sell_cache.get('scanner_mtime') == stamp:
+            entries = {k: e for k, e in self._sell_cache.get('entries', {}).items()
+                       if now - e['at'] < SELL_CACHE_TTL}
+        entries[key] = {'sells': sorted(sells), 'at': now}
+        
+        self._sell_cache = {'scanner_mtime': stamp, 'entries': entries}
+        try:
+            SELL_CACHE_FILE.write_text(json.dumps(self._sell_cache))
+        except OSError as e:
+            print(f"⚠️  Could not save sell cache: {e}")
     
     def _parse_sells(self, output: str, known_tickers: Set[str]) -> Set[str]:
         """Parse scanner output to find tickers in Sell zone"""
         sells = set()
         
         in_sell_section = False
+        lines = output.split('\n')
         
-        for line in output.split('\n'):
+        for line in lines:
             line_upper = line.upper()
             
             # Detect sell section
@@ -123,21 +330,27 @@ class ScannerBridge:
             # Extract tickers from sell section
             if in_sell_section:
                 # Find potential tickers
-                words = re.findall(r'\b([A-Z]{1,5})\b', line)
-                for word in words:
+                for word in _WORD_RE.findall(line):
                     if word in known_tickers:
                         sells.add(word)
         
-        # Also check for explicit sell markers anywhere
-        for ticker in known_tickers:
-            # Look for patterns like "AAPL ... SELL" or "🔴 AAPL"
-            patterns = [
-                rf'\b{ticker}\b.*(?:SELL|🔴)',
-                rf'(?:SELL|🔴).*\b{ticker}\b',
-            ]
-            for pattern in patterns:
-                if re.search(pattern, output, re.IGNORECASE):
-                    sells.add(ticker)
+        if not known_tickers:
+            return sells
+        
+        # Also check for explicit sell markers anywhere: a ticker and a
+        # SELL/🔴 on the same line, in either order (case-insensitive)
+        ticker_re, by_lower = _ticker_matcher(frozenset(known_tickers))
+        
+        for line in lines:
+            if '🔴' not in line and 'sell' not in line.lower():
+                continue
+            markers = [m.span() for m in _SELL_MARKER_RE.finditer(line)]
+            if not markers:
+                continue
+            for m in ticker_re.finditer(line):
+                start, end = m.span()
+                if any(ms >= end or me <= start for ms, me in markers):
+                    sells.update(by_lower[m.group().lower()])
         
         return sells
     
@@ -149,12 +362,19 @@ class ScannerBridge:
         if not self._validate():
             return 'unknown'
         
+        if self._scanner is not None:
+            zones = self._scan_in_process([ticker])
+            if zones is not None:
+                zone = zones.get(ticker, 'unknown')
+                return zone if zone in _ZONES else 'unknown'
+        
         try:
             # Quick check using scanner
             result = subprocess.run(
-                [sys.executable, 'main.py', '--no-email', '--quiet', '--tickers', ticker],
+                [*_PYTHON, 'main.py', '--no-email', '--quiet', '--tickers', ticker],
                 capture_output=True,
-                text=True,
+                encoding='utf-8',
+                errors='replace',
                 cwd=str(self.scanner_dir),
                 timeout=60
             )
@@ -203,8 +423,7 @@ def detect_sells_from_file(content: str, tickers: List[str]) -> Set[str]:
             continue
         
         if in_sell_section:
-            words = re.findall(r'\b([A-Z]{1,5})\b', line)
-            for word in words:
+            for word in _WORD_RE.findall(line):
                 if word in tickers_set:
                     sells.add(word)
     
@@ -43,13 +43,72 @@ Signature data structure:
 
 import json
 import hashlib
-from datetime import datetime
+import bisect
+import mmap
+import os
+from contextlib import contextmanager
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict, field
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
 
 from config import SIGNATURES_FILE, RUNS_DIR, get_market_status
-from prices import PriceFetcher
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
+
+# Advisory file locks serialize journal appends, catch-up and compaction
+# across bt.py processes (fcntl on POSIX, msvcrt on Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Mutations are appended to a journal next to the snapshot; once it holds
+# this many entries the snapshot is rewritten and the journal removed
+_COMPACT_EVERY = 200
+
+
+def _dumps(data) -> bytes:
+    """Compact JSON encoding (journal entries and the snapshot)"""
+    if orjson:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def _loads(raw):
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Hold an exclusive advisory lock on path for the duration of the block"""
+    with open(path, 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        elif msvcrt:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _today() -> str:
+    """Today's date as YYYY-MM-DD"""
+    return date.today().isoformat()
 
 
 @dataclass
@@ -68,17 +127,36 @@ class Position:
     pnl_amt: Optional[float] = None
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Spelled out rather than dataclasses.asdict(): no field
+        # introspection or recursive copying for a handful of scalars
+        return {
+            'ticker': self.ticker,
+            'category': self.category,
+            'entry_price': self.entry_price,
+            'entry_date': self.entry_date,
+            'entry_type': self.entry_type,
+            'status': self.status,
+            'exit_price': self.exit_price,
+            'exit_date': self.exit_date,
+            'exit_reason': self.exit_reason,
+            'pnl_pct': self.pnl_pct,
+            'pnl_amt': self.pnl_amt,
+        }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Position':
         return cls(**data)
     
-    def close(self, price: float, reason: str = "sell_signal"):
-        """Close this position"""
+    def close(self, price: float, reason: str = "sell_signal", today: Optional[str] = None):
+        """
+        Close this position.
+        
+        today is the exit date (YYYY-MM-DD); callers closing many positions
+        at once pass it in rather than reading the clock per position.
+        """
         self.status = "closed"
         self.exit_price = price
-        self.exit_date = datetime.now().strftime("%Y-%m-%d")
+        self.exit_date = today or _today()
         self.exit_reason = reason
         self.pnl_amt = price - self.entry_price
         self.pnl_pct = (self.pnl_amt / self.entry_price) * 100 if self.entry_price > 0 else 0
@@ -98,6 +176,19 @@ class Signature:
     # Stored output
     output_file: str = ""
     
+    # get_summary() cache, keyed by (len(positions), _mutations)
+    _mutations: int = field(default=0, init=False, repr=False, compare=False)
+    _summary: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    _summary_key: Optional[Tuple[int, int]] = field(default=None, init=False, repr=False, compare=False)
+    
+    # Tickers of open positions, in position order (a dict used as an
+    # ordered set); kept in sync by close_position
+    _open_tickers: Dict[str, None] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._open_tickers = dict.fromkeys(
+            t for t, p in self.positions.items() if p.status == "open")
+    
     def to_dict(self) -> dict:
         d = {
             'signature_id': self.signature_id,
@@ -130,71 +221,330 @@ class Signature:
     
     def get_summary(self) -> dict:
         """Calculate current summary statistics"""
-        open_positions = [p for p in self.positions.values() if p.status == "open"]
-        closed_positions = [p for p in self.positions.values() if p.status == "closed"]
-        
-        winners = [p for p in closed_positions if (p.pnl_pct or 0) > 0]
-        losers = [p for p in closed_positions if (p.pnl_pct or 0) <= 0]
+        key = (len(self.positions), self._mutations)
+        if self._summary_key == key:
+            return dict(self._summary)
         
-        realized_pnl = sum(p.pnl_pct or 0 for p in closed_positions)
+        # One pass over the positions, counting instead of building lists
+        open_n = closed_n = win_n = loss_n = 0
+        realized_pnl = 0
+        for p in self.positions.values():
+            if p.status == "open":
+                open_n += 1
+            elif p.status == "closed":
+                closed_n += 1
+                pnl = p.pnl_pct or 0
+                realized_pnl += pnl
+                if pnl > 0:
+                    win_n += 1
+                else:
+                    loss_n += 1
         
-        return {
+        self._summary = {
             'total_positions': len(self.positions),
-            'open_positions': len(open_positions),
-            'closed_positions': len(closed_positions),
+            'open_positions': open_n,
+            'closed_positions': closed_n,
             'realized_pnl_pct': realized_pnl,
-            'win_count': len(winners),
-            'loss_count': len(losers),
-            'win_rate': len(winners) / len(closed_positions) * 100 if closed_positions else 0
+            'win_count': win_n,
+            'loss_count': loss_n,
+            'win_rate': win_n / closed_n * 100 if closed_n else 0
         }
+        self._summary_key = key
+        return dict(self._summary)
     
     def get_open_tickers(self) -> List[str]:
         """Get list of tickers with open positions"""
-        return [t for t, p in self.positions.items() if p.status == "open"]
+        return list(self._open_tickers)
     
-    def close_position(self, ticker: str, price: float, reason: str = "sell_signal") -> bool:
-        """Close a position by ticker"""
+    def close_position(self, ticker: str, price: float, reason: str = "sell_signal",
+                       today: Optional[str] = None) -> bool:
+        """Close a position by ticker (today: exit date, see Position.close)"""
         if ticker in self.positions and self.positions[ticker].status == "open":
-            self.positions[ticker].close(price, reason)
+            self.positions[ticker].close(price, reason, today)
+            self._open_tickers.pop(ticker, None)
+            self._mutations += 1
             return True
         return False
 
 
+class _SignatureStore(MutableMapping):
+    """
+    signature_id -> Signature, holding the parsed JSON dicts from disk and
+    building each Signature (and its Positions) on first access.
+    
+    Commands that touch a handful of signatures don't pay for converting
+    the whole history; attr() reads a field without converting at all.
+    """
+    
+    def __init__(self):
+        self._data: Dict[str, object] = {}  # Signature or its raw dict
+    
+    def __getitem__(self, signature_id: str) -> Signature:
+        value = self._data[signature_id]
+        if isinstance(value, dict):
+            value = self._data[signature_id] = Signature.from_dict(value)
+        return value
+    
+    def __setitem__(self, signature_id: str, value):
+        self._data[signature_id] = value
+    
+    def __delitem__(self, signature_id: str):
+        del self._data[signature_id]
+    
+    def __contains__(self, signature_id) -> bool:
+        return signature_id in self._data
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def attr(self, signature_id: str, name: str):
+        """One top-level field of a signature, without building it"""
+        value = self._data[signature_id]
+        return value[name] if isinstance(value, dict) else getattr(value, name)
+    
+    def positions(self, signature_id: str) -> Dict[str, bool]:
+        """ticker -> is the position open, without building the signature"""
+        value = self._data[signature_id]
+        if isinstance(value, dict):
+            return {t: p.get('status', 'open') == 'open'
+                    for t, p in value.get('positions', {}).items()}
+        return {t: t in value._open_tickers for t in value.positions}
+    
+    def raw(self, signature_id: str) -> dict:
+        """A signature in its to_dict() form"""
+        value = self._data[signature_id]
+        return value if isinstance(value, dict) else value.to_dict()
+
+
 class SignatureManager:
     """Manages all signatures"""
     
     def __init__(self):
-        self.signatures: Dict[str, Signature] = {}  # signature_id -> Signature
-        self.hash_index: Dict[str, str] = {}  # file_hash -> signature_id
-        self._load()
+        self._journal = SIGNATURES_FILE.with_suffix('.journal')
+        self._lock_file = SIGNATURES_FILE.with_suffix('.lock')
+        with _file_lock(self._lock_file):
+            self._load()
     
     def _load(self):
-        """Load signatures from disk"""
-        if SIGNATURES_FILE.exists():
-            with open(SIGNATURES_FILE) as f:
-                data = json.load(f)
-                
+        """
+        Load signatures from disk (snapshot, then journal replay).
+        
+        Called with the store lock held.
+        """
+        self.signatures = _SignatureStore()  # signature_id -> Signature
+        self.hash_index: Dict[str, str] = {}  # file_hash -> signature_id
+        self._sorted: Optional[List[str]] = None  # IDs newest first, built on demand
+        # ticker -> IDs of signatures holding it open (dicts as ordered sets)
+        self._open_ticker_index: Dict[str, Dict[str, None]] = {}
+        self._snapshot = self._snapshot_stamp()  # identifies the snapshot we loaded
+        self._journal_pos = 0  # journal bytes already applied
+        self._journal_len = 0  # entries in the journal since the last snapshot
+        
+        if self._snapshot is not None:
+            data = _loads(SIGNATURES_FILE.read_bytes())
+            
             for sig_data in data.get('signatures', []):
-                sig = Signature.from_dict(sig_data)
-                self.signatures[sig.signature_id] = sig
-                self.hash_index[sig.file_hash] = sig.signature_id
+                self.signatures[sig_data['signature_id']] = sig_data
+                self.hash_index[sig_data['file_hash']] = sig_data['signature_id']
+        
+        self._ids: List[str] = sorted(self.signatures)  # sorted IDs for prefix lookup
+        for sig_id in self.signatures:
+            self._index_open(sig_id)
+        
+        self._read_journal()
+    
+    @staticmethod
+    def _snapshot_stamp() -> Optional[Tuple[int, int, int]]:
+        """(inode, size, mtime) of the snapshot; compaction always changes it"""
+        try:
+            st = SIGNATURES_FILE.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+    
+    def _read_journal(self):
+        """Apply journal entries past the ones already read (lock held)"""
+        if not self._journal.exists():
+            return
+        
+        with open(self._journal, 'r+b') as f:
+            f.seek(self._journal_pos)
+            good_end = self._journal_pos  # offset just past the last readable entry
+            for line in f:
+                try:
+                    entry = _loads(line)
+                except ValueError:
+                    continue
+                self._replay(entry)
+                self._journal_len += 1
+                good_end = f.tell()
+            
+            # Drop a torn final line from an interrupted append so the
+            # next entry starts on a line of its own
+            if f.tell() > good_end:
+                f.truncate(good_end)
+        
+        self._journal_pos = good_end
+    
+    def _catch_up(self):
+        """
+        Bring the in-memory state up to date with other processes' writes
+        (lock held).
+        
+        If another process compacted since we loaded, the journal entries we
+        had read are gone and its snapshot holds them, so start over from it.
+        """
+        if self._snapshot_stamp() != self._snapshot:
+            self._load()
+        else:
+            self._read_journal()
+    
+    def _index_open(self, signature_id: str):
+        """Sync _open_ticker_index with one signature's open positions"""
+        index = self._open_ticker_index
+        for ticker, is_open in self.signatures.positions(signature_id).items():
+            if is_open:
+                index.setdefault(ticker, {})[signature_id] = None
+            elif ticker in index:
+                self._unindex(ticker, signature_id)
+    
+    def _unindex(self, ticker: str, signature_id: str):
+        holders = self._open_ticker_index[ticker]
+        holders.pop(signature_id, None)
+        if not holders:
+            del self._open_ticker_index[ticker]
+    
+    def _put(self, signature_id: str, value):
+        """Store a Signature (or its raw dict) and update the indexes"""
+        store = self.signatures
+        if signature_id in store:
+            old_hash = store.attr(signature_id, 'file_hash')
+            if self.hash_index.get(old_hash) == signature_id:
+                del self.hash_index[old_hash]
+        else:
+            bisect.insort(self._ids, signature_id)
+        
+        store[signature_id] = value
+        self.hash_index[store.attr(signature_id, 'file_hash')] = signature_id
+        self._index_open(signature_id)
+        self._sorted = None
+    
+    def _remove(self, signature_id: str):
+        """Drop a signature and its index entries (no-op if absent)"""
+        store = self.signatures
+        if signature_id not in store:
+            return
+        
+        self.hash_index.pop(store.attr(signature_id, 'file_hash'), None)
+        for ticker in store.positions(signature_id):
+            if ticker in self._open_ticker_index:
+                self._unindex(ticker, signature_id)
+        
+        del store[signature_id]
+        self._ids.remove(signature_id)
+        self._sorted = None
+    
+    def _replay(self, entry: dict):
+        """Apply one journal entry to the in-memory state"""
+        if entry['op'] == 'put':
+            self._put(entry['sig']['signature_id'], entry['sig'])
+        elif entry['op'] == 'delete':
+            self._remove(entry['id'])
+    
+    def _append(self, entries: List[dict]):
+        """
+        Record mutations in the journal (lock held, state caught up).
+        
+        Each entry is one JSON line, so the cost of a save is proportional to
+        the signatures that changed rather than to the whole store.
+        """
+        payload = b''.join(_dumps(e) + b'\n' for e in entries)
+        with open(self._journal, 'ab') as f:
+            f.write(payload)
+        self._journal_pos += len(payload)
+        self._journal_len += len(entries)
+        
+        if self._journal_len >= _COMPACT_EVERY:
+            self._compact()
+    
+    def _save_signatures(self, signatures: List['Signature']):
+        """Persist updated (or new) signatures"""
+        entries = [{'op': 'put', 'sig': sig.to_dict()} for sig in signatures]
+        with _file_lock(self._lock_file):
+            self._catch_up()
+            for sig in signatures:
+                self._put(sig.signature_id, sig)
+            self._append(entries)
     
     def _save(self):
         """Save signatures to disk"""
         data = {
-            'signatures': [sig.to_dict() for sig in self.signatures.values()],
+            'signatures': [self.signatures.raw(sig_id) for sig_id in self.signatures],
             'updated_at': datetime.now().isoformat()
         }
-        with open(SIGNATURES_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Compact encoding: the file is machine-read, and indentation
+        # inflates it by ~40%. Written to a sibling and renamed into place
+        # so an interrupted save leaves the previous snapshot intact.
+        tmp = SIGNATURES_FILE.with_suffix('.json.tmp')
+        tmp.write_bytes(_dumps(data))
+        os.replace(tmp, SIGNATURES_FILE)
+    
+    def compact(self):
+        """Rewrite the snapshot with the current state and remove the journal"""
+        with _file_lock(self._lock_file):
+            self._catch_up()
+            self._compact()
+    
+    def _compact(self):
+        # Lock held and every journal entry already applied, so nothing in
+        # the journal is lost by removing it
+        self._save()
+        self._journal.unlink(missing_ok=True)
+        self._snapshot = self._snapshot_stamp()
+        self._journal_pos = 0
+        self._journal_len = 0
     
     def compute_file_hash(self, content: str, mode: str = '') -> str:
         """
         Compute hash of file content + mode.
         Same file with different modes = different signatures.
         """
-        combined = f"{content}:{mode}"
-        return f"sha256:{hashlib.sha256(combined.encode()).hexdigest()}"
+        # Same bytes as hashing f"{content}:{mode}", without building the
+        # concatenated copy of the content first
+        hasher = hashlib.sha256(content.encode())
+        hasher.update(f":{mode}".encode())
+        return f"sha256:{hasher.hexdigest()}"
+    
+    def read_file(self, path: Path, mode: str = '') -> Tuple[str, str]:
+        """
+        Read a scanner output file and compute its file hash.
+        
+        The file is memory-mapped and hashed straight from the mapping, then
+        decoded once - no intermediate copies of the raw bytes.
+        
+        Returns:
+            Tuple of (content, file_hash), where file_hash equals
+            compute_file_hash(content, mode).
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return '', self.compute_file_hash('', mode)
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher = hashlib.sha256(mm)
+                hasher.update(f":{mode}".encode())
+                content = str(mm, 'utf-8')
+        
+        if '\r' in content:
+            # Same newline handling as a text-mode read; the raw bytes no
+            # longer match the content, so hash the normalized text
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+            return content, self.compute_file_hash(content, mode)
+        
+        return content, f"sha256:{hasher.hexdigest()}"
     
     def get_by_hash(self, file_hash: str) -> Optional[Signature]:
         """Get signature by file hash (returns existing if file was seen before)"""
@@ -209,8 +559,10 @@ class SignatureManager:
         if signature_id in self.signatures:
             return self.signatures[signature_id]
         
-        # Partial match
-        matches = [s for s in self.signatures.keys() if s.startswith(signature_id)]
+        # Partial match: IDs sharing a prefix are adjacent in sorted order,
+        # so only look at the few IDs after the prefix's insertion point
+        start = bisect.bisect_left(self._ids, signature_id)
+        matches = [s for s in self._ids[start:start + 5] if s.startswith(signature_id)]
         if len(matches) == 1:
             return self.signatures[matches[0]]
         elif len(matches) > 1:
@@ -224,7 +576,8 @@ class SignatureManager:
                          file_content: str,
                          source_file: str,
                          mode: str,
-                         parsed_stocks: Dict[str, List[str]]) -> Tuple[Signature, bool]:
+                         parsed_stocks: Dict[str, List[str]],
+                         precomputed_hash: Optional[str] = None) -> Tuple[Signature, bool]:
         """
         Create a new signature or return existing one if file was seen before.
         
@@ -233,11 +586,12 @@ class SignatureManager:
             source_file: Original filename
             mode: Trading mode (strong, early, all, dividend)
             parsed_stocks: Dict with keys: strong_buys, early_buys, dividends, buys, sells
+            precomputed_hash: Hash from read_file(), skips rehashing the content
         
         Returns:
             Tuple of (Signature, is_new)
         """
-        file_hash = self.compute_file_hash(file_content, mode)
+        file_hash = precomputed_hash or self.compute_file_hash(file_content, mode)
         
         # Check if file was already processed
         existing = self.get_by_hash(file_hash)
@@ -270,21 +624,25 @@ class SignatureManager:
                 buy_tickers.append(t)
                 ticker_categories[t] = 'dividend'
         
-        # Fetch entry prices
-        fetcher = PriceFetcher()
-        price_data = fetcher.get_entry_prices(buy_tickers)
+        # Fetch entry prices (yfinance is only loaded when actually needed).
+        # The shared fetcher keeps its HTTP session and entry-price cache
+        # across signatures created in the same run.
+        price_data = {}
+        if buy_tickers:
+            from prices import get_fetcher
+            price_data = get_fetcher().get_entry_prices(buy_tickers)
         
         # Create positions
         positions = {}
         for ticker in buy_tickers:
-            if ticker in price_data:
-                pd = price_data[ticker]
+            entry = price_data.get(ticker)
+            if entry is not None:
                 positions[ticker] = Position(
                     ticker=ticker,
                     category=ticker_categories[ticker],
-                    entry_price=pd['price'],
-                    entry_date=pd['date'],
-                    entry_type=pd['price_type']
+                    entry_price=entry['price'],
+                    entry_date=entry['date'],
+                    entry_type=entry['price_type']
                 )
         
         # Save raw output
@@ -307,30 +665,38 @@ class SignatureManager:
         )
         
         # Store
-        self.signatures[signature_id] = sig
-        self.hash_index[file_hash] = signature_id
-        self._save()
+        self._save_signatures([sig])
         
         return sig, True
     
     def update_signature(self, signature: Signature):
         """Save updates to a signature"""
-        self.signatures[signature.signature_id] = signature
-        self._save()
+        self._save_signatures([signature])
+    
+    def update_signatures(self, signatures: List[Signature]):
+        """Save updates to several signatures with a single journal append"""
+        if not signatures:
+            return
+        
+        self._save_signatures(signatures)
     
     def list_all(self, 
                  mode: Optional[str] = None,
                  limit: int = 50) -> List[Signature]:
         """List all signatures, optionally filtered by mode"""
-        results = list(self.signatures.values())
+        # Sort by date, newest first (once per change, not per call)
+        store = self.signatures
+        if self._sorted is None:
+            self._sorted = sorted(store, key=lambda i: store.attr(i, 'created_at'),
+                                  reverse=True)
         
+        # Filter and sort on the raw fields; only the returned signatures
+        # are built
+        ids = self._sorted
         if mode and mode != 'all':
-            results = [s for s in results if s.mode == mode]
+            ids = [i for i in ids if store.attr(i, 'mode') == mode]
         
-        # Sort by date, newest first
-        results.sort(key=lambda x: x.created_at, reverse=True)
-        
-        return results[:limit]
+        return [store[i] for i in ids[:limit]]
     
     def get_all_open_positions(self) -> Dict[str, List[Tuple[str, Position]]]:
         """
@@ -339,12 +705,16 @@ class SignatureManager:
         """
         open_positions = {}
         
-        for sig_id, sig in self.signatures.items():
-            for ticker, pos in sig.positions.items():
+        # Only signatures holding a ticker open are visited; the status
+        # check covers positions closed but not yet saved
+        for ticker, sig_ids in self._open_ticker_index.items():
+            holders = []
+            for sig_id in sig_ids:
+                pos = self.signatures[sig_id].positions[ticker]
                 if pos.status == "open":
-                    if ticker not in open_positions:
-                        open_positions[ticker] = []
-                    open_positions[ticker].append((sig_id, pos))
+                    holders.append((sig_id, pos))
+            if holders:
+                open_positions[ticker] = holders
         
         return open_positions
     
@@ -360,6 +730,28 @@ class SignatureManager:
                 return f.read()
         return None
     
+    def get_output_head(self, signature_id: str, n: int) -> Optional[Tuple[str, int]]:
+        """
+        Get the first n + 1 characters of a signature's stored output.
+        
+        Returns (head, total_size_in_bytes), or None if the signature or its
+        output file is missing. Only the head is read from disk; the output
+        was truncated iff len(head) > n. The byte size is for display only
+        (newline translation and the locale encoding make it differ from
+        the character count).
+        """
+        sig = self.get_by_id(signature_id)
+        if not sig or not sig.output_file:
+            return None
+        
+        output_path = RUNS_DIR / sig.output_file
+        try:
+            total = os.path.getsize(output_path)
+            with open(output_path) as f:
+                return f.read(n + 1), total
+        except FileNotFoundError:
+            return None
+    
     def delete_signature(self, signature_id: str) -> bool:
         """Delete a signature"""
         sig = self.get_by_id(signature_id)
@@ -371,12 +763,10 @@ class SignatureManager:
             output_path = RUNS_DIR / sig.output_file
             output_path.unlink(missing_ok=True)
         
-        # Remove from index
-        if sig.file_hash in self.hash_index:
-            del self.hash_index[sig.file_hash]
-        
-        del self.signatures[sig.signature_id]
-        self._save()
+        with _file_lock(self._lock_file):
+            self._catch_up()
+            self._remove(sig.signature_id)
+            self._append([{'op': 'delete', 'id': sig.signature_id}])
         
         return True
 